@@ -0,0 +1,7 @@
+"""Compatibility helpers for the supported Python versions."""
+
+import sys
+
+# Keyword arguments for @dataclass that drop the per-instance __dict__ where
+# supported; dataclass(slots=True) was added in Python 3.10
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
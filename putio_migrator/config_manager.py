@@ -1,10 +1,27 @@
 """Configuration management for Put.io to NAS migration tool."""
 
 import sys
-import toml
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+# Prefer the fastest available TOML parser: the stdlib tomllib on Python
+# 3.11+, or its tomli backport (installed on older versions). rtoml and the
+# pure-Python toml package are only used if neither is present.
+try:
+    import tomllib as _toml_parser  # Python 3.11+
+    _TOML_BINARY_MODE = True
+except ImportError:
+    try:
+        import tomli as _toml_parser
+        _TOML_BINARY_MODE = True
+    except ImportError:
+        try:
+            import rtoml as _toml_parser
+            _TOML_BINARY_MODE = False
+        except ImportError:
+            import toml as _toml_parser
+            _TOML_BINARY_MODE = False
+
 
 class ConfigValidationError(Exception):
     """Raised when configuration validation fails."""
@@ -25,7 +42,9 @@ class ConfigManager:
         "download": {
             "connections": 4,
             "timeout": 30,
-            "retry_limit": 3
+            "retry_limit": 3,
+            "verify_size": True,
+            "concurrent_files": 1
         },
         "filters": {
             "max_file_size_gb": None,
@@ -47,11 +66,72 @@ class ConfigManager:
         },
         "advanced": {
             "api_requests_per_second": 5,
+            "scan_workers": 4,
             "user_agent": "putio-migrator/0.1.0",
             "use_fallback_downloader": True
         }
     }
     
+    # Written verbatim when the configuration file is missing
+    SAMPLE_CONFIG = """\
+[putio]
+oauth_token = "YOUR_PUTIO_OAUTH_TOKEN_HERE"
+api_base_url = "https://api.put.io/v2"
+
+[destination]
+base_path = "/path/to/your/nas/downloads"
+preserve_structure = true
+
+[download]
+connections = 4
+timeout = 30
+retry_limit = 3
+verify_size = true
+concurrent_files = 1
+
+[filters]
+allowed_extensions = ["mp4", "mkv", "avi", "mp3", "flac"]
+blocked_extensions = ["tmp", "part"]
+
+[behavior]
+auto_confirm = false
+cleanup_after_download = false
+rescan_on_startup = true
+
+[state]
+file_path = "migration_state.json"
+save_frequency_seconds = 30
+
+[logging]
+level = "INFO"
+file_path = "migration.log"
+
+[advanced]
+api_requests_per_second = 5
+scan_workers = 4
+user_agent = "putio-migrator/0.1.0"
+use_fallback_downloader = true
+"""
+    
+    # Value rules checked by _validate_config once defaults are applied:
+    # (section, key, accepted types, range check, error message)
+    VALUE_RULES = (
+        ("download", "connections", int, lambda v: 1 <= v <= 16,
+         "Download connections must be between 1 and 16"),
+        ("download", "timeout", (int, float), lambda v: v > 0,
+         "Download timeout must be positive"),
+        ("download", "retry_limit", int, lambda v: v >= 0,
+         "Download retry limit must be non-negative"),
+        ("download", "concurrent_files", int, lambda v: 1 <= v <= 16,
+         "Concurrent downloads must be between 1 and 16"),
+        ("state", "save_frequency_seconds", (int, float), lambda v: v >= 0,
+         "State save frequency must be non-negative"),
+        ("advanced", "api_requests_per_second", (int, float), lambda v: v > 0,
+         "API requests per second must be positive"),
+        ("advanced", "scan_workers", int, lambda v: 1 <= v <= 16,
+         "Scan workers must be between 1 and 16"),
+    )
+    
     def __init__(self, config_path: str):
         """Initialize configuration manager.
         
@@ -71,12 +151,49 @@ class ConfigManager:
             sys.exit(0)
         
         self._load_config()
-        self._validate_config()
+        # Sections are validated on first access so commands that only touch
+        # part of the configuration skip the rest; see validate_all()
+        self._sections: Dict[str, Dict[str, Any]] = {}
     
-    def _load_config(self):
-        """Load configuration from TOML file."""
-        with open(self.config_path, 'r') as f:
-            self._raw_config = toml.load(f)
+    @classmethod
+    def from_string(cls, text: str, source: str = "<string>") -> "ConfigManager":
+        """Build a configuration from TOML text without reading a file.
+        
+        Args:
+            text: TOML configuration document
+            source: Name used for the configuration in error messages
+            
+        Raises:
+            ConfigValidationError: If the text is not valid TOML
+        """
+        config = cls.__new__(cls)
+        config.config_path = Path(source)
+        config._load_config(text)
+        config._sections = {}
+        return config
+    
+    def _load_config(self, text: Optional[str] = None):
+        """Load configuration from TOML file, or from ``text`` when given.
+        
+        Raises:
+            ConfigValidationError: If the file is not valid TOML
+        """
+        try:
+            if text is not None:
+                self._raw_config = _toml_parser.loads(text)
+            elif _TOML_BINARY_MODE:
+                # tomllib and tomli decode the UTF-8 bytes themselves
+                with open(self.config_path, 'rb') as f:
+                    self._raw_config = _toml_parser.load(f)
+            else:
+                # rtoml and toml take text; read it in one call as UTF-8
+                # (as TOML requires) rather than in the locale encoding
+                self._raw_config = _toml_parser.loads(
+                    self.config_path.read_text(encoding='utf-8'))
+        except ValueError as e:
+            # TOMLDecodeError (tomllib/tomli), rtoml.TomlParsingError,
+            # toml.TomlDecodeError and UnicodeDecodeError are all ValueError subclasses
+            raise ConfigValidationError(f"Invalid TOML in {self.config_path}: {e}")
         
         # Apply defaults for missing sections
         for section_name, section_defaults in self.DEFAULTS.items():
@@ -87,114 +204,145 @@ class ConfigManager:
                 if key not in self._raw_config[section_name]:
                     self._raw_config[section_name][key] = default_value
     
-    def _validate_config(self):
-        """Validate configuration values."""
-        # Required fields
-        if not self._raw_config.get("putio", {}).get("oauth_token"):
-            raise ConfigValidationError("OAuth token is required in [putio] section")
+    def validate_all(self):
+        """Validate every configuration section now instead of on first access.
         
-        if not self._raw_config.get("destination", {}).get("base_path"):
-            raise ConfigValidationError("Destination base path is required in [destination] section")
+        Raises:
+            ConfigValidationError: If any section is invalid
+        """
+        for section_name in self.DEFAULTS:
+            self._section(section_name)
+    
+    def _section(self, name: str) -> Dict[str, Any]:
+        """Return a configuration section, validating it on first access.
         
-        # Validate destination path exists
-        dest_path = Path(self._raw_config["destination"]["base_path"])
-        if not dest_path.exists():
-            raise ConfigValidationError(f"Destination path does not exist: {dest_path}")
+        Args:
+            name: Section name
+            
+        Returns:
+            Validated section values
+            
+        Raises:
+            ConfigValidationError: If the section is invalid
+        """
+        section = self._sections.get(name)
+        if section is None:
+            # Copy so later changes to the raw data are not re-read
+            section = dict(self._raw_config[name])
+            self._validate_section(name, section)
+            self._sections[name] = section
+            # Resolve the values into "_<section>_<key>" fields, so the
+            # accessors below read one attribute instead of indexing dicts
+            for key, value in section.items():
+                setattr(self, f"_{name}_{key}", value)
+        return section
+    
+    def __getattr__(self, name: str) -> Any:
+        """Validate and resolve a section the first time one of its fields is read.
+        
+        Only called when normal lookup fails, i.e. for fields of a section
+        that has not been validated yet.
         
-        # Validate numeric ranges
-        connections = self._raw_config["download"]["connections"]
-        if not (1 <= connections <= 16):
-            raise ConfigValidationError("Download connections must be between 1 and 16")
+        Raises:
+            ConfigValidationError: If the section is invalid
+            AttributeError: If ``name`` is not a configuration field
+        """
+        # Read through __dict__: this hook must not recurse before __init__ is done
+        sections = self.__dict__.get('_sections')
+        section_name = name[1:].partition('_')[0]
+        if (sections is not None and name.startswith('_')
+                and section_name in self.DEFAULTS and section_name not in sections):
+            self._section(section_name)
+            if name in self.__dict__:
+                return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+    
+    def _validate_section(self, name: str, section: Dict[str, Any]):
+        """Validate the values of one configuration section."""
+        # Required fields
+        if name == "putio" and not section.get("oauth_token"):
+            raise ConfigValidationError("OAuth token is required in [putio] section")
         
-        timeout = self._raw_config["download"]["timeout"]
-        if timeout <= 0:
-            raise ConfigValidationError("Download timeout must be positive")
+        if name == "destination":
+            if not section.get("base_path"):
+                raise ConfigValidationError("Destination base path is required in [destination] section")
+            
+            # Validate destination path exists
+            dest_path = Path(section["base_path"])
+            if not dest_path.exists():
+                raise ConfigValidationError(f"Destination path does not exist: {dest_path}")
         
-        retry_limit = self._raw_config["download"]["retry_limit"]
-        if retry_limit < 0:
-            raise ConfigValidationError("Download retry limit must be non-negative")
+        # Validate value types and ranges against the declarative schema
+        for rule_section, key, types, is_valid, message in self.VALUE_RULES:
+            if rule_section != name:
+                continue
+            value = section[key]
+            # bool is an int subclass but never a meaningful count or duration
+            if isinstance(value, bool) or not isinstance(value, types) or not is_valid(value):
+                raise ConfigValidationError(message)
     
     def _create_sample_config(self):
         """Create sample configuration file."""
-        sample_config = {
-            "putio": {
-                "oauth_token": "YOUR_PUTIO_OAUTH_TOKEN_HERE",
-                "api_base_url": "https://api.put.io/v2"
-            },
-            "destination": {
-                "base_path": "/path/to/your/nas/downloads",
-                "preserve_structure": True
-            },
-            "download": {
-                "connections": 4,
-                "timeout": 30,
-                "retry_limit": 3
-            },
-            "filters": {
-                "max_file_size_gb": None,
-                "allowed_extensions": ["mp4", "mkv", "avi", "mp3", "flac"],
-                "blocked_extensions": ["tmp", "part"]
-            },
-            "behavior": {
-                "auto_confirm": False,
-                "cleanup_after_download": False,
-                "rescan_on_startup": True
-            },
-            "state": {
-                "file_path": "migration_state.json",
-                "save_frequency_seconds": 30
-            },
-            "logging": {
-                "level": "INFO",
-                "file_path": "migration.log"
-            },
-            "advanced": {
-                "api_requests_per_second": 5,
-                "user_agent": "putio-migrator/0.1.0",
-                "use_fallback_downloader": True
-            }
-        }
-        
-        with open(self.config_path, 'w') as f:
-            toml.dump(sample_config, f)
+        self.config_path.write_text(self.SAMPLE_CONFIG, encoding='utf-8')
     
-    # Property accessors for easy access to configuration values
+    # Read-only accessors for the resolved fields; the first read of a
+    # section's field validates that section
     @property
     def putio_oauth_token(self) -> str:
-        return self._raw_config["putio"]["oauth_token"]
+        return self._putio_oauth_token
     
     @property
     def putio_api_base_url(self) -> str:
-        return self._raw_config["putio"]["api_base_url"]
+        return self._putio_api_base_url
     
     @property
     def destination_base_path(self) -> str:
-        return self._raw_config["destination"]["base_path"]
+        return self._destination_base_path
     
     @property
     def destination_preserve_structure(self) -> bool:
-        return self._raw_config["destination"]["preserve_structure"]
+        return self._destination_preserve_structure
     
     @property
     def download_connections(self) -> int:
-        return self._raw_config["download"]["connections"]
+        return self._download_connections
     
     @property
     def download_timeout(self) -> int:
-        return self._raw_config["download"]["timeout"]
+        return self._download_timeout
     
     @property
     def download_retry_limit(self) -> int:
-        return self._raw_config["download"]["retry_limit"]
+        return self._download_retry_limit
+    
+    @property
+    def rescan_on_startup(self) -> bool:
+        return self._behavior_rescan_on_startup
+    
+    @property
+    def download_verify_size(self) -> bool:
+        return self._download_verify_size
+    
+    @property
+    def download_concurrent_files(self) -> int:
+        return self._download_concurrent_files
     
     @property
     def logging_level(self) -> str:
-        return self._raw_config["logging"]["level"]
+        return self._logging_level
     
     @property
     def state_file_path(self) -> str:
-        return self._raw_config["state"]["file_path"]
+        return self._state_file_path
     
     @property
     def state_save_frequency(self) -> int:
-        return self._raw_config["state"]["save_frequency_seconds"]
\ No newline at end of file
+        return self._state_save_frequency_seconds
+    
+    @property
+    def api_requests_per_second(self) -> int:
+        return self._advanced_api_requests_per_second
+    
+    @property
+    def scan_workers(self) -> int:
+        return self._advanced_scan_workers
@@ -1,21 +1,54 @@
 """Download management with Axel integration and fallback support."""
 
 import logging
+import os
+import shutil
 import subprocess
+import tempfile
+import threading
 import requests
+import urllib3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 from pathlib import Path
-from typing import Optional
+from typing import Any, BinaryIO, List, Optional, Set, Tuple
 from dataclasses import dataclass
 
+from ._compat import DATACLASS_SLOTS
 from .file_scanner import FileTreeNode
 
 
+# Copy buffer for the fallback downloader; large blocks keep per-chunk Python overhead negligible
+FALLBACK_CHUNK_SIZE = 1024 * 1024
+
+# Smallest byte range worth its own connection in the fallback downloader
+RANGED_MIN_PART_SIZE = 16 * 1024 * 1024
+
+# Trailing bytes of Axel output kept for error messages
+AXEL_OUTPUT_TAIL = 4096
+
+
 class DownloadError(Exception):
     """Raised when download fails."""
     pass
 
 
-@dataclass
+def _safe_stat(path: Path) -> Optional[os.stat_result]:
+    """Stat a path with a single syscall.
+    
+    Args:
+        path: Path to stat
+        
+    Returns:
+        The stat result, or None if the path doesn't exist
+    """
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+@dataclass(**DATACLASS_SLOTS)
 class DownloadResult:
     """Result of a download operation."""
     success: bool
@@ -30,7 +63,9 @@ class DownloadManager:
     """Manages file downloads using Axel with fallback to requests."""
     
     def __init__(self, destination_path: str, connections: int = 4, timeout: int = 30,
-                 preserve_structure: bool = True, use_fallback: bool = True):
+                 preserve_structure: bool = True, use_fallback: bool = True,
+                 verify_size: bool = True, concurrent_files: int = 1,
+                 stop_event: Optional[threading.Event] = None):
         """Initialize download manager.
         
         Args:
@@ -39,13 +74,48 @@ class DownloadManager:
             timeout: Download timeout in seconds
             preserve_structure: Whether to preserve folder structure
             use_fallback: Whether to use requests fallback if Axel fails
+            verify_size: Whether to stat files after a successful Axel run
+            concurrent_files: Number of files downloaded at once through this manager
+            stop_event: Set when the migration is stopping; no fallback starts after
+                that, and Axel runs started afterwards are terminated right away
         """
         self.destination_path = Path(destination_path)
         self.connections = connections
         self.timeout = timeout
         self.preserve_structure = preserve_structure
         self.use_fallback = use_fallback
+        self.verify_size = verify_size
+        self.stop_event = stop_event
         self.logger = logging.getLogger(__name__)
+        # Running Axel processes, so terminate_downloads() can stop them
+        self._processes: Set[subprocess.Popen] = set()
+        self._processes_lock = threading.Lock()
+        
+        # Reuse one keep-alive session for fallback downloads so each file
+        # doesn't pay for a new TCP connection and TLS handshake. Every
+        # concurrent file may fetch `connections` ranges at once, and a full
+        # pool would discard connections instead of keeping them alive
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'putio-migrator/0.1.0'})
+        adapter = HTTPAdapter(pool_connections=connections,
+                              pool_maxsize=connections * max(1, concurrent_files),
+                              max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def close(self):
+        """Close pooled connections held by the fallback session."""
+        self.session.close()
+    
+    def terminate_downloads(self):
+        """Terminate running Axel processes.
+        
+        Axel saves its progress on SIGTERM, so the partial files are resumed
+        on the next run.
+        """
+        with self._processes_lock:
+            for process in self._processes:
+                process.terminate()
     
     def download_file(self, file_node: FileTreeNode, download_url: str) -> DownloadResult:
         """Download a file using Axel or fallback method.
@@ -63,11 +133,10 @@ class DownloadManager:
         else:
             target_path = self.destination_path / file_node.name
         
-        # Create directory structure if needed
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Check if file already exists and is complete
-        if target_path.exists() and target_path.stat().st_size == file_node.size:
+        # Check if file already exists and is complete; on resume most files
+        # take this path, so it costs a single stat
+        target_stat = _safe_stat(target_path)
+        if target_stat is not None and target_stat.st_size == file_node.size:
             self.logger.info(f"File already exists and is complete: {target_path}")
             return DownloadResult(
                 success=True,
@@ -75,10 +144,24 @@ class DownloadManager:
                 already_existed=True
             )
         
+        # Create directory structure if needed; an existing file means it exists
+        if target_stat is None:
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+        
         # Try downloading with Axel first
         try:
-            return self._download_with_axel(file_node, download_url, target_path)
+            return self._download_with_axel(file_node, download_url, target_path,
+                                            resume=target_stat is not None)
         except (FileNotFoundError, DownloadError) as e:
+            if self.stop_event is not None and self.stop_event.is_set():
+                # Ctrl+C reaches Axel too; a full fallback download now would
+                # hold up the shutdown. The partial file is resumed next run
+                self.logger.info(f"Download of {file_node.name} interrupted, not falling back")
+                return DownloadResult(
+                    success=False,
+                    file_path=str(target_path),
+                    error_message=f"Interrupted: {str(e)}"
+                )
             if self.use_fallback:
                 self.logger.warning(f"Axel failed ({str(e)}), trying fallback method")
                 return self._download_with_requests(file_node, download_url, target_path)
@@ -86,13 +169,14 @@ class DownloadManager:
                 raise DownloadError(f"Axel download failed and fallback disabled: {str(e)}")
     
     def _download_with_axel(self, file_node: FileTreeNode, download_url: str, 
-                           target_path: Path) -> DownloadResult:
+                           target_path: Path, resume: bool = False) -> DownloadResult:
         """Download file using Axel.
         
         Args:
             file_node: File node metadata
             download_url: Download URL
             target_path: Target file path
+            resume: Whether a partial file exists and should be continued
             
         Returns:
             DownloadResult
@@ -108,7 +192,7 @@ class DownloadManager:
         ]
         
         # Add resume option if partial file exists
-        if target_path.exists():
+        if resume:
             command.append("-c")
         
         command.append(download_url)
@@ -116,27 +200,31 @@ class DownloadManager:
         try:
             self.logger.info(f"Starting Axel download: {file_node.name}")
             self.logger.debug(f"Axel command: {' '.join(command)}")
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout + 5  # Add buffer for process overhead
-            )
-            self.logger.debug(f"Axel completed with return code: {result.returncode}")
-            
-            if result.returncode != 0:
-                error_msg = f"Axel download failed (code {result.returncode}): {result.stderr}"
-                raise DownloadError(error_msg)
-            
-            # Verify file integrity
-            if not target_path.exists():
-                raise DownloadError("Downloaded file does not exist")
-            
-            actual_size = target_path.stat().st_size
-            if actual_size != file_node.size:
-                raise DownloadError(
-                    f"File size mismatch: expected {file_node.size}, got {actual_size}"
+            # Spool Axel's progress output to disk instead of buffering it all
+            # in memory; only its tail is needed, and only on failure
+            with tempfile.TemporaryFile() as output:
+                result = self._run_axel(
+                    command,
+                    stdout=output,
+                    stderr=subprocess.STDOUT,
+                    timeout=self.timeout + 5  # Add buffer for process overhead
                 )
+                self.logger.debug(f"Axel completed with return code: {result.returncode}")
+                
+                if result.returncode != 0:
+                    error_msg = (f"Axel download failed (code {result.returncode}): "
+                                 f"{self._read_tail(output)}")
+                    raise DownloadError(error_msg)
+            
+            # Verify file integrity, or trust Axel's exit status when disabled
+            if self.verify_size:
+                actual_size = self._get_downloaded_size(target_path)
+                if actual_size != file_node.size:
+                    raise DownloadError(
+                        f"File size mismatch: expected {file_node.size}, got {actual_size}"
+                    )
+            else:
+                actual_size = file_node.size
             
             self.logger.info(f"Successfully downloaded: {file_node.name}")
             return DownloadResult(
@@ -150,10 +238,37 @@ class DownloadManager:
         except FileNotFoundError:
             raise DownloadError("Axel command not found")
     
+    def _run_axel(self, command: List[str], timeout: Optional[float] = None,
+                  **kwargs: Any) -> subprocess.CompletedProcess:
+        """Run Axel like ``subprocess.run``, tracked so terminate_downloads() can stop it.
+        
+        Raises:
+            subprocess.TimeoutExpired: If Axel runs longer than ``timeout``; it is killed
+        """
+        with subprocess.Popen(command, **kwargs) as process:
+            with self._processes_lock:
+                self._processes.add(process)
+            try:
+                if self.stop_event is not None and self.stop_event.is_set():
+                    # Stopping began while this one was starting up
+                    process.terminate()
+                returncode = process.wait(timeout=timeout)
+            except BaseException:
+                process.kill()
+                raise
+            finally:
+                with self._processes_lock:
+                    self._processes.discard(process)
+        return subprocess.CompletedProcess(command, returncode)
+    
     def _download_with_requests(self, file_node: FileTreeNode, download_url: str,
                                target_path: Path) -> DownloadResult:
         """Download file using requests as fallback.
         
+        The body is written to ``<target>.part`` and only renamed onto the
+        target once it is complete, so an interrupted or failed download is
+        never mistaken for a finished file by the next run's size check.
+        
         Args:
             file_node: File node metadata
             download_url: Download URL
@@ -161,40 +276,197 @@ class DownloadManager:
             
         Returns:
             DownloadResult
+            
+        Raises:
+            DownloadError: If the download fails or is incomplete
         """
+        part_path = target_path.with_name(target_path.name + '.part')
         try:
             self.logger.info(f"Starting fallback download: {file_node.name}")
             
-            with requests.get(download_url, stream=True, timeout=self.timeout) as response:
-                response.raise_for_status()
-                
-                with open(target_path, 'wb') as f:
-                    bytes_downloaded = 0
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                            bytes_downloaded += len(chunk)
+            ranges = self._split_ranges(file_node.size)
+            if len(ranges) > 1:
+                self._download_ranges(download_url, part_path, file_node.size, ranges)
+            else:
+                with self.session.get(download_url, stream=True, timeout=self.timeout) as response:
+                    response.raise_for_status()
+                    with open(part_path, 'wb') as f:
+                        self._preallocate(f, file_node.size)
+                        self._copy_response(response, f)
             
             # Verify file integrity
-            if not target_path.exists():
-                raise DownloadError("Downloaded file does not exist")
-            
-            actual_size = target_path.stat().st_size
+            actual_size = self._get_downloaded_size(part_path)
             if actual_size != file_node.size:
                 raise DownloadError(
                     f"File size mismatch: expected {file_node.size}, got {actual_size}"
                 )
             
-            self.logger.info(f"Successfully downloaded with fallback: {file_node.name}")
-            return DownloadResult(
-                success=True,
-                file_path=str(target_path),
-                used_fallback=True,
-                bytes_downloaded=actual_size
-            )
-            
-        except requests.exceptions.RequestException as e:
+            os.replace(part_path, target_path)
+        except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+            # Reading response.raw surfaces urllib3's errors (ProtocolError,
+            # ReadTimeoutError) unwrapped
+            part_path.unlink(missing_ok=True)
             raise DownloadError(f"Fallback download failed: {str(e)}")
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+        
+        self.logger.info(f"Successfully downloaded with fallback: {file_node.name}")
+        return DownloadResult(
+            success=True,
+            file_path=str(target_path),
+            used_fallback=True,
+            bytes_downloaded=actual_size
+        )
+    
+    def _split_ranges(self, size: int) -> List[Tuple[int, int]]:
+        """Split a file into byte ranges to fetch over separate connections.
+        
+        Args:
+            size: File size in bytes
+            
+        Returns:
+            Inclusive (start, end) byte ranges; a single range when the file is
+            too small to split or positional writes are unavailable
+        """
+        parts = min(self.connections, size // RANGED_MIN_PART_SIZE)
+        if parts < 2 or not hasattr(os, 'pwrite'):
+            return [(0, size - 1)]
+        
+        part_size = -(-size // parts)  # ceiling division
+        return [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+    
+    def _download_ranges(self, download_url: str, target_path: Path, size: int,
+                         ranges: List[Tuple[int, int]]):
+        """Download byte ranges concurrently and write each at its file offset.
+        
+        The first range doubles as the probe for range support: if the server
+        answers with the whole file instead of 206, that body is used as-is.
+        The first failing range stops the others at their next chunk.
+        
+        Args:
+            download_url: Download URL
+            target_path: Target file path
+            size: Expected file size in bytes
+            ranges: Inclusive (start, end) byte ranges covering the file
+            
+        Raises:
+            DownloadError: If a range response is shorter than requested
+        """
+        cancelled = threading.Event()
+        first_start, first_end = ranges[0]
+        with open(target_path, 'wb') as f:
+            self._preallocate(f, size)
+            
+            with self._get_range(download_url, first_start, first_end) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    self.logger.debug("Server ignored the Range header, using a single stream")
+                    self._copy_response(response, f)
+                    return
+                
+                with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                    futures = [executor.submit(self._write_range, response, f.fileno(),
+                                               first_start, first_end, cancelled)]
+                    futures += [executor.submit(self._fetch_range, download_url, f.fileno(),
+                                                start, end, cancelled)
+                                for start, end in ranges[1:]]
+                    try:
+                        for future in as_completed(futures):
+                            future.result()
+                    except BaseException:
+                        # The file will be discarded; don't download the rest of it
+                        cancelled.set()
+                        for future in futures:
+                            future.cancel()
+                        raise
+    
+    def _get_range(self, download_url: str, start: int, end: int) -> requests.Response:
+        """Request one inclusive byte range of a download."""
+        return self.session.get(
+            download_url,
+            stream=True,
+            timeout=self.timeout,
+            # Ranges index the bytes on disk, so the body must not be re-encoded
+            headers={'Range': f'bytes={start}-{end}', 'Accept-Encoding': 'identity'}
+        )
+    
+    def _fetch_range(self, download_url: str, fd: int, start: int, end: int,
+                     cancelled: threading.Event):
+        """Download one byte range and write it at its offset in ``fd``."""
+        if cancelled.is_set():
+            raise DownloadError(f"Range {start}-{end} cancelled")
+        with self._get_range(download_url, start, end) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise DownloadError(f"Server did not honor range {start}-{end}")
+            self._write_range(response, fd, start, end, cancelled)
+    
+    def _write_range(self, response: requests.Response, fd: int, start: int, end: int,
+                     cancelled: threading.Event):
+        """Copy a range response body to ``fd`` starting at offset ``start``.
+        
+        Raises:
+            DownloadError: If the body is shorter than the requested range, or
+                ``cancelled`` is set because another range failed
+        """
+        offset = start
+        while offset <= end:
+            if cancelled.is_set():
+                raise DownloadError(f"Range {start}-{end} cancelled")
+            chunk = response.raw.read(min(FALLBACK_CHUNK_SIZE, end + 1 - offset))
+            if not chunk:
+                raise DownloadError(
+                    f"Range {start}-{end} ended early: got {offset - start} of {end + 1 - start} bytes"
+                )
+            os.pwrite(fd, chunk, offset)
+            offset += len(chunk)
+    
+    def _copy_response(self, response: requests.Response, f: BinaryIO):
+        """Copy a full response body into a freshly opened file."""
+        # Let urllib3 undo any Content-Encoding while copying the raw stream
+        response.raw.decode_content = True
+        shutil.copyfileobj(response.raw, f, FALLBACK_CHUNK_SIZE)
+        # Drop any preallocated space the response didn't fill
+        f.truncate(f.tell())
+    
+    def _read_tail(self, output: BinaryIO) -> str:
+        """Read the last AXEL_OUTPUT_TAIL bytes of a spooled output file."""
+        size = output.seek(0, os.SEEK_END)
+        output.seek(max(0, size - AXEL_OUTPUT_TAIL))
+        return output.read().decode('utf-8', errors='replace').strip()
+    
+    def _preallocate(self, f, size: int):
+        """Reserve disk space for a download to avoid fragmented extents.
+        
+        Args:
+            f: File object opened for writing
+            size: Expected file size in bytes
+        """
+        if size <= 0 or not hasattr(os, 'posix_fallocate'):
+            return
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+        except OSError as e:
+            # Not supported by every filesystem (e.g. some network shares)
+            self.logger.debug(f"Preallocation skipped for {size} bytes: {str(e)}")
+    
+    def _get_downloaded_size(self, target_path: Path) -> int:
+        """Get the size of a freshly downloaded file.
+        
+        Args:
+            target_path: Downloaded file path
+            
+        Returns:
+            Size in bytes
+            
+        Raises:
+            DownloadError: If the file does not exist
+        """
+        target_stat = _safe_stat(target_path)
+        if target_stat is None:
+            raise DownloadError("Downloaded file does not exist")
+        return target_stat.st_size
     
     def get_partial_download_size(self, file_path: Path) -> int:
         """Get size of partially downloaded file.
@@ -205,6 +477,5 @@ class DownloadManager:
         Returns:
             Size in bytes, or 0 if file doesn't exist
         """
-        if file_path.exists():
-            return file_path.stat().st_size
-        return 0
\ No newline at end of file
+        file_stat = _safe_stat(file_path)
+        return file_stat.st_size if file_stat is not None else 0
\ No newline at end of file
@@ -1,13 +1,15 @@
 """File scanning and tree building for Put.io accounts."""
 
 import logging
-from typing import List, Dict, Any, Optional, Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable, Iterator
 from dataclasses import dataclass
 
+from ._compat import DATACLASS_SLOTS
 from .putio_client import PutioClient, PutioAPIError
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ScanProgress:
     """Progress information during account scanning."""
     folders_scanned: int = 0
@@ -16,7 +18,7 @@ class ScanProgress:
     current_folder: str = ""
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class FileTreeNode:
     """Represents a file or folder in the Put.io file tree."""
     name: str
@@ -35,16 +37,29 @@ class FileTreeNode:
 class FileScanner:
     """Scans Put.io account and builds complete file tree."""
     
-    def __init__(self, putio_client: PutioClient, file_filters: Optional[Dict[str, Any]] = None):
+    def __init__(self, putio_client: PutioClient, file_filters: Optional[Dict[str, Any]] = None,
+                 max_workers: int = 4, progress_interval: int = 1):
         """Initialize file scanner.
         
         Args:
             putio_client: Put.io API client
             file_filters: Optional filters for files (extensions, size limits, etc.)
+            max_workers: Number of folders listed concurrently
+            progress_interval: Report progress every this many scanned folders or discovered files
         """
         self.client = putio_client
         self.file_filters = file_filters or {}
+        self.max_workers = max(1, max_workers)
+        self.progress_interval = max(1, progress_interval)
         self.logger = logging.getLogger(__name__)
+        
+        # Normalize filters once rather than for every scanned file
+        allowed = self.file_filters.get('allowed_extensions')
+        blocked = self.file_filters.get('blocked_extensions')
+        max_size_gb = self.file_filters.get('max_file_size_gb')
+        self._allowed_exts = frozenset(ext.lower() for ext in allowed) if allowed else None
+        self._blocked_exts = frozenset(ext.lower() for ext in blocked) if blocked else None
+        self._max_size_bytes = int(max_size_gb * 1024 ** 3) if max_size_gb is not None else None
         self._total_size = 0
         self._all_files = []
     
@@ -62,16 +77,9 @@ class FileScanner:
         self._all_files = []
         
         progress = ScanProgress()
-        root_node = FileTreeNode(
-            name="root",
-            file_id=0,
-            size=0,
-            is_folder=True,
-            parent_id=-1,
-            full_path=""
-        )
+        root_node = self._create_root()
         
-        self._scan_folder_recursive(root_node, progress, progress_callback)
+        self._scan_tree(root_node, progress, progress_callback)
         
         self.logger.info(f"Scan completed: {progress.files_discovered} files, "
                         f"{progress.folders_scanned} folders, "
@@ -79,98 +87,243 @@ class FileScanner:
         
         return root_node
     
-    def _scan_folder_recursive(self, folder_node: FileTreeNode, progress: ScanProgress,
-                              progress_callback: Optional[Callable[[ScanProgress], None]]):
-        """Recursively scan a folder and its subfolders.
+    def export_tree(self, root_node: FileTreeNode) -> List[List[Any]]:
+        """Flatten a scanned tree into records that ``load_tree`` can rebuild.
         
         Args:
-            folder_node: Folder node to scan
+            root_node: Root node returned by ``scan_account``
+            
+        Returns:
+            ``[file_id, parent_id, name, size, is_folder]`` records in depth-first order
+        """
+        records = []
+        stack = [iter(root_node.children)]
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+                continue
+            records.append([node.file_id, node.parent_id, node.name, node.size, node.is_folder])
+            if node.is_folder:
+                stack.append(iter(node.children))
+        return records
+    
+    def load_tree(self, records: List[List[Any]]) -> FileTreeNode:
+        """Rebuild a file tree from ``export_tree`` records without calling the API.
+        
+        The current filters are applied again, so a cached tree never
+        contains files the configuration now excludes.
+        
+        Args:
+            records: Records produced by ``export_tree``
+            
+        Returns:
+            Root node of the rebuilt file tree
+        """
+        self._total_size = 0
+        self._all_files = []
+        
+        root_node = self._create_root()
+        folders = {root_node.file_id: root_node}
+        
+        for file_id, parent_id, name, size, is_folder in records:
+            parent = folders.get(parent_id)
+            if parent is None:
+                # Parent folder was not rebuilt
+                continue
+            
+            node = self._add_child(parent, file_id, name, size, is_folder)
+            if node is None:
+                continue
+            if node.is_folder:
+                folders[node.file_id] = node
+            else:
+                self._record_file(node)
+        
+        self.logger.info(f"Loaded cached scan: {len(self._all_files)} files, "
+                         f"{self._total_size} bytes total")
+        return root_node
+    
+    def _create_root(self) -> FileTreeNode:
+        """Create the root folder node of an account tree."""
+        return FileTreeNode(
+            name="root",
+            file_id=0,
+            size=0,
+            is_folder=True,
+            parent_id=-1,
+            full_path=""
+        )
+    
+    def _record_file(self, node: FileTreeNode):
+        """Add a discovered file to the flat file list and size totals."""
+        self._total_size += node.size
+        self._all_files.append(node)
+    
+    def _scan_tree(self, root_node: FileTreeNode, progress: ScanProgress,
+                   progress_callback: Optional[Callable[[ScanProgress], None]]):
+        """Walk the folder tree depth-first while listing folders concurrently.
+        
+        A listing for every discovered subfolder is submitted to a thread pool
+        as soon as the subfolder is found, so requests run ahead of the walk.
+        The walk itself consumes the listings in depth-first order, which keeps
+        the tree, ``get_all_files()`` and progress updates in the same order as
+        a sequential recursive scan.
+        
+        Args:
+            root_node: Root folder node to scan
             progress: Progress tracking object
             progress_callback: Optional progress callback
         """
-        try:
-            progress.current_folder = folder_node.full_path or "/"
-            progress.folders_scanned += 1
-            
-            if progress_callback:
+        # Folder IDs already queued for listing; guards against cyclic listings
+        seen = {root_node.file_id}
+        listings: Dict[int, Future] = {}
+        # Whether progress changed since the last callback
+        unreported = False
+        
+        def report(count: int):
+            # Folders and files are both throttled, so accounts with many
+            # small folders don't produce an update per folder
+            nonlocal unreported
+            unreported = True
+            if progress_callback and count % self.progress_interval == 0:
                 progress_callback(progress)
-            
-            # Get files in this folder
-            response = self.client.list_files(folder_node.file_id)
-            files = response.get("files", [])
-            
-            for file_data in files:
-                if self._should_include_file(file_data):
-                    # Build full path
-                    if folder_node.full_path:
-                        full_path = f"{folder_node.full_path}/{file_data['name']}"
-                    else:
-                        full_path = file_data['name']
-                    
-                    # Create node
-                    node = FileTreeNode(
-                        name=file_data['name'],
-                        file_id=file_data['id'],
-                        size=file_data['size'],
-                        is_folder=(file_data['file_type'] == 'FOLDER'),
-                        parent_id=folder_node.file_id,
-                        full_path=full_path
-                    )
+                unreported = False
+        
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            def enter_folder(folder_node: FileTreeNode) -> Iterator[FileTreeNode]:
+                progress.current_folder = folder_node.full_path or "/"
+                progress.folders_scanned += 1
+                report(progress.folders_scanned)
+                
+                for file_data in listings.pop(folder_node.file_id).result():
+                    # Look each field up once per entry
+                    file_id = file_data['id']
+                    name = file_data['name']
+                    is_folder = file_data['file_type'] == 'FOLDER'
                     
-                    folder_node.children.append(node)
+                    if is_folder:
+                        if file_id in seen:
+                            self.logger.warning(
+                                f"Skipping folder {name} (id {file_id}) "
+                                f"in {progress.current_folder}: already scanned"
+                            )
+                            continue
+                        seen.add(file_id)
                     
-                    if node.is_folder:
-                        # Recursively scan subfolder
-                        self._scan_folder_recursive(node, progress, progress_callback)
-                    else:
-                        # Track file statistics
-                        progress.files_discovered += 1
-                        progress.total_bytes_discovered += node.size
-                        self._total_size += node.size
-                        self._all_files.append(node)
-                        
-                        if progress_callback:
-                            progress_callback(progress)
+                    node = self._add_child(folder_node, file_id, name, file_data['size'], is_folder)
+                    if is_folder:
+                        listings[file_id] = executor.submit(self._list_folder, node)
+                
+                return iter(folder_node.children)
+            
+            listings[root_node.file_id] = executor.submit(self._list_folder, root_node)
+            stack = [enter_folder(root_node)]
+            
+            while stack:
+                node = next(stack[-1], None)
+                if node is None:
+                    stack.pop()
+                elif node.is_folder:
+                    stack.append(enter_folder(node))
+                else:
+                    # Track file statistics
+                    progress.files_discovered += 1
+                    progress.total_bytes_discovered += node.size
+                    self._record_file(node)
+                    report(progress.files_discovered)
+        except BaseException:
+            # Don't let Ctrl+C or an error wait for queued listings, each of
+            # which would still pass through rate limiting and retries
+            for listing in listings.values():
+                listing.cancel()
+            executor.shutdown(wait=False)
+            raise
+        executor.shutdown(wait=True)
         
+        # Throttled updates may have skipped the last folders or files;
+        # always report the final totals
+        if progress_callback and unreported:
+            progress_callback(progress)
+    
+    def _list_folder(self, folder_node: FileTreeNode) -> List[Dict[str, Any]]:
+        """List the entries of a single folder.
+        
+        Args:
+            folder_node: Folder node to list
+            
+        Returns:
+            File data entries, or an empty list if the folder could not be listed
+        """
+        try:
+            response = self.client.list_files(folder_node.file_id)
+            return response.get("files", [])
         except Exception as e:
             self.logger.warning(f"Error scanning folder {folder_node.full_path}: {str(e)}")
             # Continue scanning other folders even if one fails
+            return []
     
-    def _should_include_file(self, file_data: Dict[str, Any]) -> bool:
-        """Check if file should be included based on filters.
+    def _add_child(self, folder_node: FileTreeNode, file_id: int, name: str, size: int,
+                   is_folder: bool) -> Optional[FileTreeNode]:
+        """Create a child node for a listed entry if it passes the filters.
         
         Args:
-            file_data: File data from Put.io API
+            folder_node: Parent folder node
+            file_id: Put.io file ID
+            name: Entry name
+            size: Entry size in bytes
+            is_folder: Whether the entry is a folder
             
         Returns:
-            True if file should be included
+            The new child node, or None if the entry was filtered out
         """
         # Always include folders for structure
-        if file_data['file_type'] == 'FOLDER':
-            return True
+        if not is_folder and not self._should_include_file(name, size):
+            return None
         
-        file_name = file_data['name']
-        file_size = file_data['size']
+        # Build full path
+        if folder_node.full_path:
+            full_path = f"{folder_node.full_path}/{name}"
+        else:
+            full_path = name
         
+        node = FileTreeNode(
+            name=name,
+            file_id=file_id,
+            size=size,
+            is_folder=is_folder,
+            parent_id=folder_node.file_id,
+            full_path=full_path
+        )
+        
+        folder_node.children.append(node)
+        return node
+    
+    def _should_include_file(self, file_name: str, file_size: int) -> bool:
+        """Check if a file should be included based on filters.
+        
+        Args:
+            file_name: File name
+            file_size: File size in bytes
+            
+        Returns:
+            True if file should be included
+        """
         # Check file extension filters
-        allowed_extensions = self.file_filters.get('allowed_extensions')
-        if allowed_extensions:
-            file_ext = file_name.split('.')[-1].lower() if '.' in file_name else ''
-            if file_ext not in [ext.lower() for ext in allowed_extensions]:
+        if self._allowed_exts is not None or self._blocked_exts is not None:
+            _, dot, ext = file_name.rpartition('.')
+            file_ext = ext.lower() if dot else ''
+            
+            if self._allowed_exts is not None and file_ext not in self._allowed_exts:
                 return False
-        
-        blocked_extensions = self.file_filters.get('blocked_extensions')
-        if blocked_extensions:
-            file_ext = file_name.split('.')[-1].lower() if '.' in file_name else ''
-            if file_ext in [ext.lower() for ext in blocked_extensions]:
+            
+            if self._blocked_exts is not None and file_ext in self._blocked_exts:
                 return False
         
         # Check file size limits
-        max_size_gb = self.file_filters.get('max_file_size_gb')
-        if max_size_gb is not None:
-            max_size_bytes = max_size_gb * 1024 * 1024 * 1024
-            if file_size > max_size_bytes:
-                return False
+        if self._max_size_bytes is not None and file_size > self._max_size_bytes:
+            return False
         
         return True
     
@@ -3,33 +3,49 @@
 import sys
 import argparse
 import logging
+import signal
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from operator import attrgetter
 from typing import Dict, Any, List
 
 from .config_manager import ConfigManager
 from .state_manager import StateManager
 from .putio_client import PutioClient
-from .file_scanner import FileScanner, ScanProgress
+from .file_scanner import FileScanner, FileTreeNode, ScanProgress
 from .download_manager import DownloadManager
 
 
 class MigrationOrchestrator:
     """Orchestrates the complete migration workflow."""
     
-    def __init__(self, config_path: str):
+    def __init__(self, config_path: str, force_rescan: bool = False, dry_run: bool = False):
         """Initialize migration orchestrator.
         
         Args:
             config_path: Path to TOML configuration file
+            force_rescan: Scan Put.io even if a cached scan may be reused
+            dry_run: Only scan; sections a scan doesn't use are validated lazily
+            
+        Raises:
+            ConfigValidationError: If the configuration is invalid
         """
         self.config_path = config_path
+        self.force_rescan = force_rescan
         
         # Initialize components
         self.config = ConfigManager(config_path)
+        if not dry_run:
+            # A bad destination must fail now, not after a long account scan
+            self.config.validate_all()
         self.state = StateManager(self.config.state_file_path, self.config.state_save_frequency)
         self.putio_client = PutioClient(
             self.config.putio_oauth_token,
             self.config.putio_api_base_url,
-            self.config.download_retry_limit
+            self.config.download_retry_limit,
+            self.config.api_requests_per_second,
+            # Scanner and download workers share the client's connections
+            pool_size=max(self.config.scan_workers, self.config.download_concurrent_files)
         )
         
         # Setup logging
@@ -48,21 +64,38 @@ class MigrationOrchestrator:
         # Verify Put.io authentication
         try:
             account_info = self.putio_client.get_account_info()
-            self.logger.info(f"Authenticated as: {account_info['info']['username']}")
+            username = account_info['info']['username']
+            self.logger.info(f"Authenticated as: {username}")
         except Exception as e:
             self.logger.error(f"Authentication failed: {str(e)}")
             raise Exception("Authentication failed")
         
-        # Scan Put.io account for files
-        self.logger.info("Scanning Put.io account...")
-        scanner = FileScanner(self.putio_client)
+        scanner = FileScanner(self.putio_client, max_workers=self.config.scan_workers,
+                              progress_interval=100)
+        
+        # Reuse the previous run's scan when rescanning on startup is disabled
+        rescan = self.config.rescan_on_startup or self.force_rescan
+        cached_scan = None if rescan else self.state.get_scan_cache(username)
         
-        def progress_callback(progress: ScanProgress):
-            if progress.files_discovered % 100 == 0:  # Report every 100 files
+        if cached_scan is not None:
+            self.logger.info("Using cached scan from previous run (rescan_on_startup = false)")
+            file_tree = scanner.load_tree(cached_scan)
+        else:
+            # Scan Put.io account for files
+            self.logger.info("Scanning Put.io account...")
+            
+            def progress_callback(progress: ScanProgress):
+                # The scanner already throttles updates to every 100 files
                 print(f"Scanning... Found {progress.files_discovered} files, "
                       f"{progress.total_bytes_discovered // (1024*1024)} MB")
+            
+            file_tree = scanner.scan_account(progress_callback)
+            # Only keep the tree on disk when a later run may reuse it
+            self.state.set_scan_cache(
+                username,
+                None if self.config.rescan_on_startup else scanner.export_tree(file_tree)
+            )
         
-        file_tree = scanner.scan_account(progress_callback)
         all_files = scanner.get_all_files()
         total_size = scanner.get_total_size()
         
@@ -80,6 +113,7 @@ class MigrationOrchestrator:
         Returns:
             Dictionary with migration results and statistics
         """
+        download_manager = None
         try:
             self.logger.info("Starting Put.io to NAS migration")
             
@@ -90,7 +124,12 @@ class MigrationOrchestrator:
             total_size = scan_result["total_size"]
             
             # Filter out already completed files
-            pending_files = [f for f in all_files if not self.state.is_file_completed(f.full_path)]
+            completed_paths = self.state.completed_paths()
+            pending_files = [f for f in all_files if f.full_path not in completed_paths]
+            if self.config.download_concurrent_files > 1:
+                # Start the largest files first so no long download is left
+                # running alone at the end while the other workers sit idle
+                pending_files.sort(key=attrgetter('size'), reverse=True)
             
             if not pending_files:
                 self.logger.info("All files already downloaded")
@@ -115,66 +154,146 @@ class MigrationOrchestrator:
             
             self.logger.info(f"Starting download of {len(pending_files)} files")
             
+            # Set on interruption so queued downloads that slip past
+            # cancellation return without starting, and running ones don't
+            # fall back to another full download
+            stopping = threading.Event()
+            
             # Initialize download manager
             download_manager = DownloadManager(
                 destination_path=self.config.destination_base_path,
                 connections=self.config.download_connections,
                 timeout=self.config.download_timeout,
-                preserve_structure=self.config.destination_preserve_structure
+                preserve_structure=self.config.destination_preserve_structure,
+                verify_size=self.config.download_verify_size,
+                concurrent_files=self.config.download_concurrent_files,
+                stop_event=stopping
             )
             
-            # Download files
+            # Download files, up to download.concurrent_files at a time
             completed_files = 0
             failed_files = 0
+            # Serializes state updates and counters across download workers
+            state_lock = threading.Lock()
             
             import time
             start_time = time.time()
             
-            for i, file_node in enumerate(pending_files):
+            # Download URLs are resolved up to one file per worker ahead, so a
+            # worker starting a file rarely waits on the API round-trip
+            workers = self.config.download_concurrent_files
+            url_executor = ThreadPoolExecutor(max_workers=workers)
+            url_futures: Dict[int, Future] = {}
+            url_lock = threading.Lock()
+            next_url = 0
+            
+            def prefetch_urls(upto: int):
+                nonlocal next_url
+                with url_lock:
+                    while next_url < min(upto, len(pending_files)):
+                        url_futures[next_url] = url_executor.submit(
+                            self.putio_client.get_download_url, pending_files[next_url].file_id)
+                        next_url += 1
+            
+            def report(icon: str, file_node: FileTreeNode, detail: str = ""):
+                # One line per finished file; callers hold state_lock so lines
+                # from concurrent downloads never interleave
+                done = completed_files + failed_files
+                elapsed = time.time() - start_time
+                suffix = f" - {detail}" if detail else ""
+                print(f"Progress: {done}/{len(pending_files)} {icon} {file_node.name}{suffix} (elapsed: {elapsed:.0f}s)")
+            
+            def download_one(i: int, file_node: FileTreeNode):
+                nonlocal completed_files, failed_files
+                if stopping.is_set():
+                    return
                 try:
-                    # Report progress
-                    progress_pct = (i / len(pending_files)) * 100
-                    elapsed = time.time() - start_time
-                    print(f"Progress: {progress_pct:.1f}% - Downloading {file_node.name} (elapsed: {elapsed:.0f}s)")
-                    
-                    # Get download URL with timeout handling
-                    print(f"  Getting download URL for {file_node.name}...")
+                    # Get download URL with timeout handling. Per-file debug
+                    # messages use lazy arguments so nothing is formatted
+                    # unless debug logging is enabled
+                    self.logger.debug("Getting download URL for %s", file_node.name)
+                    prefetch_urls(i + workers + 1)
+                    with url_lock:
+                        url_future = url_futures.pop(i)
                     try:
-                        download_url = self.putio_client.get_download_url(file_node.file_id)
-                        print(f"  Got download URL successfully")
+                        download_url = url_future.result()
                     except Exception as e:
-                        print(f"  ✗ Failed to get download URL: {str(e)}")
-                        self.state.mark_file_failed(file_node.full_path, f"Failed to get download URL: {str(e)}")
-                        failed_files += 1
-                        continue
+                        with state_lock:
+                            self.state.mark_file_failed(file_node.full_path, f"Failed to get download URL: {str(e)}")
+                            failed_files += 1
+                            report("✗", file_node, f"failed to get download URL: {str(e)}")
+                        return
                     
                     # Download file
-                    print(f"  Starting download of {file_node.name} ({file_node.size / (1024*1024):.1f} MB)...")
+                    self.logger.debug("Starting download of %s (%.1f MB)",
+                                      file_node.name, file_node.size / (1024*1024))
                     result = download_manager.download_file(file_node, download_url)
+                    if not result.success and stopping.is_set():
+                        # Cut short by the interruption, not failed; the file
+                        # stays pending for the next run
+                        return
                     
-                    if result.success:
-                        self.state.mark_file_completed(file_node.full_path, file_node.size)
-                        completed_files += 1
-                        print(f"  ✓ Completed: {file_node.name}")
-                        self.logger.info(f"Completed: {file_node.name}")
-                    else:
-                        self.state.mark_file_failed(file_node.full_path, result.error_message)
-                        failed_files += 1
-                        print(f"  ✗ Failed: {file_node.name} - {result.error_message}")
-                        self.logger.error(f"Failed: {file_node.name} - {result.error_message}")
-                    
-                    # Auto-save state periodically
-                    self.state.maybe_auto_save()
+                    with state_lock:
+                        if result.success:
+                            self.state.mark_file_completed(file_node.full_path, file_node.size)
+                            completed_files += 1
+                            report("✓", file_node)
+                            self.logger.info(f"Completed: {file_node.name}")
+                        else:
+                            self.state.mark_file_failed(file_node.full_path, result.error_message)
+                            failed_files += 1
+                            report("✗", file_node, result.error_message)
+                            self.logger.error(f"Failed: {file_node.name} - {result.error_message}")
+                        
+                        # Auto-save state periodically
+                        self.state.maybe_auto_save()
                     
-                except KeyboardInterrupt:
-                    print(f"\n  Interrupted during {file_node.name}")
-                    raise  # Re-raise to be caught by outer handler
                 except Exception as e:
-                    self.state.mark_file_failed(file_node.full_path, str(e))
-                    failed_files += 1
-                    print(f"  ✗ Error: {file_node.name} - {str(e)}")
+                    if stopping.is_set():
+                        return
+                    with state_lock:
+                        self.state.mark_file_failed(file_node.full_path, str(e))
+                        failed_files += 1
+                        report("✗", file_node, f"error: {str(e)}")
                     self.logger.error(f"Unexpected error for {file_node.name}: {str(e)}")
             
+            def interrupt(signum: int, frame):
+                # Set before raising: the same Ctrl+C also kills running Axel
+                # processes, and their workers must see it before falling back
+                stopping.set()
+                raise KeyboardInterrupt
+            
+            previous_handlers = {}
+            if threading.current_thread() is threading.main_thread():
+                for signum in (signal.SIGINT, signal.SIGTERM):
+                    previous_handlers[signum] = signal.signal(signum, interrupt)
+            
+            executor = ThreadPoolExecutor(max_workers=workers)
+            futures = [executor.submit(download_one, i, file_node)
+                       for i, file_node in enumerate(pending_files)]
+            try:
+                for future in futures:
+                    future.result()
+            except KeyboardInterrupt:
+                print(f"\n  Interrupted with downloads in progress")
+                raise  # Re-raise to be caught by outer handler
+            finally:
+                # Never start queued downloads after an interruption, and stop
+                # running Axel processes: SIGTERM, unlike Ctrl+C, doesn't reach
+                # them. Axel keeps its progress, so they resume next run. Wait
+                # for the workers so the state saved below is consistent
+                stopping.set()
+                for future in futures:
+                    future.cancel()
+                download_manager.terminate_downloads()
+                executor.shutdown(wait=True)
+                # Only now drop lookahead URLs: running downloads may still need theirs
+                for future in url_futures.values():
+                    future.cancel()
+                url_executor.shutdown(wait=True)
+                for signum, handler in previous_handlers.items():
+                    signal.signal(signum, handler)
+            
             # Final state save
             self.state.save_state()
             
@@ -201,6 +320,15 @@ class MigrationOrchestrator:
             self.logger.error(f"Migration failed: {str(e)}")
             self.state.save_state()
             return {"success": False, "error": str(e)}
+        finally:
+            if download_manager is not None:
+                download_manager.close()
+            self.putio_client.close()
+
+
+def _interrupt_on_sigterm(signum: int, frame):
+    """Turn SIGTERM into the same graceful shutdown as Ctrl+C."""
+    raise KeyboardInterrupt
 
 
 def main():
@@ -216,11 +344,31 @@ def main():
         action='store_true',
         help='Scan and show what would be downloaded without actually downloading'
     )
+    parser.add_argument(
+        '--force-rescan',
+        action='store_true',
+        help='Scan Put.io even when rescan_on_startup = false and a cached scan exists'
+    )
+    parser.add_argument(
+        '--check-config',
+        action='store_true',
+        help='Validate every configuration section and exit'
+    )
     
     args = parser.parse_args()
     
+    # Ctrl+C already raises KeyboardInterrupt; the orchestrator handles it by
+    # letting running downloads finish and saving state before returning
+    signal.signal(signal.SIGTERM, _interrupt_on_sigterm)
+    
     try:
-        orchestrator = MigrationOrchestrator(args.config)
+        if args.check_config:
+            ConfigManager(args.config).validate_all()
+            print(f"Configuration is valid: {args.config}")
+            return
+        
+        orchestrator = MigrationOrchestrator(args.config, force_rescan=args.force_rescan,
+                                             dry_run=args.dry_run)
         
         if args.dry_run:
             print("Dry run mode - scanning only...")
@@ -230,9 +378,8 @@ def main():
             tree = scan_result["tree"]
             all_files = scan_result["all_files"]
             
-            # Calculate totals
-            total_size = sum(f.size for f in all_files)
-            total_size_gb = total_size / (1024**3)
+            # The scanner already totalled the included files
+            total_size_gb = scan_result["total_size"] / (1024**3)
             
             print(f"\nDry run results:")
             print(f"Files found: {len(all_files)}")
@@ -258,6 +405,10 @@ def main():
             print(f"\nMigration failed: {result.get('error', 'Unknown error')}")
             sys.exit(1)
             
+    except KeyboardInterrupt:
+        # Only reached outside run_migration, e.g. during a dry-run scan
+        print("\nInterrupted by user")
+        sys.exit(1)
     except Exception as e:
         print(f"Fatal error: {str(e)}")
         sys.exit(1)
@@ -1,9 +1,19 @@
 """Put.io API client with retry logic and rate limiting."""
 
+import random
+import threading
 import time
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional
 
+# orjson parses API responses in C straight from the body bytes; the json
+# decoder behind Response.json() is used when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class PutioAPIError(Exception):
     """Raised when Put.io API returns an error."""
@@ -18,8 +28,16 @@ class PutioRateLimitError(PutioAPIError):
 class PutioClient:
     """Client for interacting with Put.io API."""
     
+    # Largest page the files/list endpoints accept
+    LIST_PAGE_SIZE = 1000
+    
+    # Retry backoff doubles per attempt up to this many seconds, stretched by up
+    # to BACKOFF_JITTER so clients that failed together don't retry in lockstep
+    BACKOFF_MAX_DELAY = 30.0
+    BACKOFF_JITTER = 0.5
+    
     def __init__(self, oauth_token: str, api_base_url: str = "https://api.put.io/v2", 
-                 retry_limit: int = 3, requests_per_second: int = 5):
+                 retry_limit: int = 3, requests_per_second: int = 5, pool_size: int = 10):
         """Initialize Put.io client.
         
         Args:
@@ -27,15 +45,27 @@ class PutioClient:
             api_base_url: Base URL for Put.io API
             retry_limit: Number of retries for failed requests
             requests_per_second: Rate limit for API requests
+            pool_size: Keep-alive connections kept open for concurrent callers
         """
         self.oauth_token = oauth_token
         self.api_base_url = api_base_url.rstrip('/')
         self.retry_limit = retry_limit
-        self.min_request_interval = 1.0 / requests_per_second
-        self.last_request_time = 0
+        # Token bucket: up to one second's worth of requests may go out in a
+        # burst, refilled at the configured rate. The lock only guards the
+        # bucket; callers sleep outside it so concurrent requests overlap
+        self._rate = float(requests_per_second)
+        self._burst = max(1.0, self._rate)
+        self._tokens = self._burst
+        self._last_refill = time.monotonic()
+        self._rate_lock = threading.Lock()
         
-        # Set up session without automatic retries (we handle retries manually)
+        # Set up session without automatic retries (we handle retries manually),
+        # keeping one pooled connection per concurrent caller so threads don't
+        # discard connections and repeat the TLS handshake
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size), max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         
         # Set default headers
         self.session.headers.update({
@@ -43,6 +73,10 @@ class PutioClient:
             'User-Agent': 'putio-migrator/0.1.0'
         })
     
+    def close(self):
+        """Close pooled keep-alive connections held by the API session."""
+        self.session.close()
+    
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """Make API request with rate limiting and error handling.
         
@@ -58,17 +92,14 @@ class PutioClient:
             PutioAPIError: If API returns error or request fails
             PutioRateLimitError: If rate limit exceeded
         """
-        # Rate limiting
-        time_since_last = time.time() - self.last_request_time
-        if time_since_last < self.min_request_interval:
-            time.sleep(self.min_request_interval - time_since_last)
-        
         url = f"{self.api_base_url}/{endpoint.lstrip('/')}"
         
         for attempt in range(self.retry_limit + 1):
+            # Every attempt, including retries, is admitted by the rate limiter
+            self._wait_for_rate_limit()
+            
             try:
                 response = self.session.request(method, url, timeout=15, **kwargs)
-                self.last_request_time = time.time()
                 
                 # Handle rate limiting
                 if response.status_code == 429:
@@ -90,7 +121,7 @@ class PutioClient:
                 # Handle server errors with retries
                 if response.status_code >= 500:
                     if attempt < self.retry_limit:
-                        time.sleep(2 ** attempt)  # Exponential backoff
+                        time.sleep(self._backoff_delay(attempt))
                         continue
                     else:
                         raise PutioAPIError(f"API request failed after {self.retry_limit} retries")
@@ -104,15 +135,49 @@ class PutioClient:
                         time.sleep(min(sleep_time, 60))  # Cap at 60 seconds
                 
                 response.raise_for_status()
-                return response.json()
+                return self._parse_json(response)
                 
             except requests.exceptions.RequestException as e:
                 if attempt < self.retry_limit:
-                    time.sleep(2 ** attempt)
+                    time.sleep(self._backoff_delay(attempt))
                     continue
                 else:
                     raise PutioAPIError(f"API request failed after {self.retry_limit} retries: {str(e)}")
     
+    def _backoff_delay(self, attempt: int) -> float:
+        """Seconds to wait before retrying a failed attempt (0-based), with jitter."""
+        jittered = (2 ** attempt) * (1 + random.uniform(0, self.BACKOFF_JITTER))
+        return min(jittered, self.BACKOFF_MAX_DELAY)
+    
+    def _parse_json(self, response: requests.Response) -> Dict[str, Any]:
+        """Decode a JSON response body.
+        
+        Raises:
+            requests.exceptions.JSONDecodeError: If the body is not valid JSON,
+                exactly as ``Response.json()`` would
+        """
+        if orjson is None:
+            return response.json()
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos)
+    
+    def _wait_for_rate_limit(self):
+        """Block until the next request may be sent under the configured rate.
+        
+        Each caller takes a token, reserving a future slot when the bucket is
+        empty, so waiting threads are admitted in order at the configured rate.
+        """
+        with self._rate_lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._last_refill) * self._rate)
+            self._last_refill = now
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+    
     def get_account_info(self) -> Dict[str, Any]:
         """Get account information."""
         return self._make_request("GET", "/account/info")
@@ -120,14 +185,27 @@ class PutioClient:
     def list_files(self, parent_id: int = 0) -> Dict[str, Any]:
         """List files in a folder.
         
+        Large folders are fetched in pages of ``LIST_PAGE_SIZE`` entries,
+        following the API cursor until every page has been read.
+        
         Args:
             parent_id: Parent folder ID (0 for root)
             
         Returns:
-            Dictionary containing files list and parent info
+            Dictionary containing the full files list and parent info
         """
-        params = {"parent_id": parent_id} if parent_id > 0 else {}
-        return self._make_request("GET", "/files/list", params=params)
+        params = {"per_page": self.LIST_PAGE_SIZE}
+        if parent_id > 0:
+            params["parent_id"] = parent_id
+        response = self._make_request("GET", "/files/list", params=params)
+        
+        cursor = response.pop("cursor", None)
+        while cursor:
+            page = self._make_request("POST", "/files/list/continue",
+                                      data={"cursor": cursor, "per_page": self.LIST_PAGE_SIZE})
+            response.setdefault("files", []).extend(page.get("files", []))
+            cursor = page.get("cursor")
+        return response
     
     def get_file_info(self, file_id: int) -> Dict[str, Any]:
         """Get information about a specific file.
@@ -1,15 +1,61 @@
 """State management for Put.io to NAS migration tool."""
 
 import json
-import signal
+import logging
+import os
+import threading
 import time
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, FrozenSet, List, Optional, Any
+from dataclasses import dataclass, asdict, is_dataclass
 
+from ._compat import DATACLASS_SLOTS
 
-@dataclass
+# orjson serializes the state (dataclasses included) in C; the stdlib json
+# module is used when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize dataclasses for the stdlib json fallback."""
+    if is_dataclass(obj):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'),
+                      default=_json_default).encode('utf-8')
+
+
+def _loads(data: bytes) -> Any:
+    """Parse UTF-8 JSON."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+# Timestamps are only informational, so bursts of state changes share one
+# ISO string instead of formatting the clock for every file
+_TIMESTAMP_GRANULARITY = 0.1
+_timestamp_cache = ("", float("-inf"))
+
+
+def _now_iso() -> str:
+    """Get the current local time in ISO format, cached for 100ms."""
+    global _timestamp_cache
+    now = time.monotonic()
+    if now - _timestamp_cache[1] >= _TIMESTAMP_GRANULARITY:
+        _timestamp_cache = (datetime.now().isoformat(), now)
+    return _timestamp_cache[0]
+
+
+@dataclass(**DATACLASS_SLOTS)
 class FileState:
     """Represents the state of a single file in the migration."""
     file_path: str
@@ -22,7 +68,7 @@ class FileState:
     
     def __post_init__(self):
         if self.last_updated is None:
-            self.last_updated = datetime.now().isoformat()
+            self.last_updated = _now_iso()
 
 
 @dataclass
@@ -37,7 +83,7 @@ class MigrationState:
     
     def __post_init__(self):
         if self.migration_start_time is None:
-            self.migration_start_time = datetime.now().isoformat()
+            self.migration_start_time = _now_iso()
 
 
 class StateManager:
@@ -51,12 +97,19 @@ class StateManager:
             auto_save_interval: Seconds between auto-saves
         """
         self.state_file_path = Path(state_file_path)
+        # Append-only log of file state changes since the last snapshot
+        self.journal_path = self.state_file_path.with_name(self.state_file_path.name + '.wal')
+        # Journal being folded into a snapshot that is still written in the background
+        self.previous_journal_path = self.journal_path.with_name(self.journal_path.name + '.prev')
+        # FileScanner.export_tree records, written once per scan; kept out of
+        # the snapshot so compactions don't rewrite the whole tree
+        self.scan_cache_path = self.state_file_path.with_name(self.state_file_path.name + '.scan')
+        self._journal = None
+        self._writer: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
         self.auto_save_interval = auto_save_interval
-        self.last_save_time = time.time()
-        
-        # Set up signal handlers for graceful shutdown
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        # Monotonic, so clock adjustments neither trigger nor postpone auto-saves
+        self.last_save_time = time.monotonic()
         
         self._load_state()
     
@@ -64,12 +117,15 @@ class StateManager:
         """Load state from file or initialize empty state."""
         if self.state_file_path.exists():
             try:
-                with open(self.state_file_path, 'r') as f:
-                    data = json.load(f)
+                # State files are always UTF-8 JSON; both decoders accept bytes
+                data = _loads(self.state_file_path.read_bytes())
                 
                 # Convert dict data back to FileState objects
                 files = {}
                 for file_path, file_data in data.get('files', {}).items():
+                    # The parser builds the key and the record's path as two
+                    # equal strings; keep one so each path is stored once
+                    file_data['file_path'] = file_path
                     files[file_path] = FileState(**file_data)
                 
                 self.state = MigrationState(
@@ -85,20 +141,90 @@ class StateManager:
                 self._initialize_empty_state()
         else:
             self._initialize_empty_state()
+        
+        damaged = self._replay_journal(self.previous_journal_path)
+        damaged = self._replay_journal(self.journal_path) or damaged
+        if damaged:
+            # New records appended after a torn one would be glued onto it
+            # and lost on the next replay; fold the journal into a snapshot
+            self.logger.warning("Skipped damaged journal records; compacting the journal")
+            self.save_state()
+    
+    def _replay_journal(self, journal_path: Path) -> bool:
+        """Apply file state changes journaled after the last snapshot.
+        
+        Returns:
+            True if a record could not be decoded and was skipped
+        """
+        if not journal_path.exists():
+            return False
+        
+        data = journal_path.read_bytes()
+        # A crash can leave the last record half-written, even without a
+        # newline for the next record to be glued onto
+        damaged = bool(data) and not data.endswith(b'\n')
+        for line in data.splitlines():
+            try:
+                file_state = FileState(**_loads(line))
+            except (json.JSONDecodeError, KeyError, TypeError):
+                damaged = True
+                continue
+            self.state.files[file_state.file_path] = file_state
+        return damaged
+    
+    def _append_journal(self, file_state: FileState):
+        """Durably record one file state change without rewriting the snapshot.
+        
+        Each record is fsynced so it survives a power loss, not just a crash
+        of the process. Records are written once per finished file, so this
+        costs little next to the download itself.
+        """
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'ab', buffering=0)
+        self._journal.write(_dumps(file_state) + b'\n')
+        os.fsync(self._journal.fileno())
     
     def _initialize_empty_state(self):
         """Initialize empty migration state."""
         self.state = MigrationState(files={})
     
-    def save_state(self):
-        """Save current state to file."""
-        # Convert FileState objects to dicts for JSON serialization
-        files_dict = {}
-        for file_path, file_state in self.state.files.items():
-            files_dict[file_path] = asdict(file_state)
+    def save_state(self, wait: bool = True):
+        """Save current state to file.
+        
+        The state is always serialized by the caller, so it is consistent with
+        every change made so far.
         
+        Args:
+            wait: Block until the snapshot is on disk. With False, the write
+                and fsync happen on a background thread and the journal is
+                only retired once they succeed.
+        """
+        self._wait_for_writer()
+        payload = self._serialize_state()
+        self._close_journal()
+        
+        if wait or self.previous_journal_path.exists():
+            # A leftover previous journal means the last background write
+            # failed; only a synchronous save can retire it safely
+            self._write_snapshot(payload)
+            for journal_path in (self.journal_path, self.previous_journal_path):
+                if journal_path.exists():
+                    journal_path.unlink()
+        else:
+            # Keep the folded-in changes replayable until the snapshot lands;
+            # new changes start a fresh journal meanwhile
+            if self.journal_path.exists():
+                os.replace(self.journal_path, self.previous_journal_path)
+            self._writer = threading.Thread(target=self._write_in_background,
+                                            args=(payload,), daemon=True)
+            self._writer.start()
+        
+        self.last_save_time = time.monotonic()
+    
+    def _serialize_state(self) -> bytes:
+        """Serialize the whole migration state to compact JSON."""
         state_dict = {
-            'files': files_dict,
+            'files': self.state.files,
             'scan_completed': self.state.scan_completed,
             'total_files_discovered': self.state.total_files_discovered,
             'total_bytes_discovered': self.state.total_bytes_discovered,
@@ -106,27 +232,113 @@ class StateManager:
             'last_scan_time': self.state.last_scan_time
         }
         
+        # Compact output: the state file is machine-written and can hold
+        # hundreds of thousands of entries
+        return _dumps(state_dict)
+    
+    def _write_snapshot(self, payload: bytes):
+        """Durably replace the state file with ``payload``."""
+        self._write_file(self.state_file_path, payload)
+    
+    def _write_file(self, path: Path, payload: bytes):
+        """Durably and atomically replace ``path`` with ``payload``."""
         # Write to temp file first, then rename for atomic operation
-        temp_file = self.state_file_path.with_suffix('.tmp')
-        with open(temp_file, 'w') as f:
-            json.dump(state_dict, f, indent=2)
+        temp_file = path.with_name(path.name + '.tmp')
+        with open(temp_file, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
         
-        temp_file.rename(self.state_file_path)
-        self.last_save_time = time.time()
+        os.replace(temp_file, path)
+    
+    def _write_in_background(self, payload: bytes):
+        """Write a snapshot, then retire the journal it supersedes."""
+        try:
+            self._write_snapshot(payload)
+            # Replaying a stale journal after a crash right here is harmless:
+            # records are idempotent
+            self.previous_journal_path.unlink(missing_ok=True)
+        except OSError as e:
+            self.logger.error(f"Background state save failed: {str(e)}")
+    
+    def _wait_for_writer(self):
+        """Wait for a background snapshot write to finish."""
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+    
+    def _close_journal(self):
+        """Close the open journal so the next change starts a new one."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
     
     def maybe_auto_save(self):
-        """Save state if enough time has passed since last save."""
-        if time.time() - self.last_save_time >= self.auto_save_interval:
-            self.save_state()
+        """Compact the journal into a snapshot if enough time has passed since last save.
+        
+        Changes are already on disk in the journal, so nothing is rewritten
+        while there are none. The snapshot is written in the background; a
+        compaction still in flight postpones the next one.
+        """
+        if self._journal is None:
+            return
+        if self._writer is not None and self._writer.is_alive():
+            return
+        if time.monotonic() - self.last_save_time >= self.auto_save_interval:
+            self.save_state(wait=False)
+    
+    def get_scan_cache(self, account: str) -> Optional[List[List[Any]]]:
+        """Get the cached scan records from the previous run, if any.
+        
+        Args:
+            account: Put.io username the records must have been scanned from
+            
+        Returns:
+            The cached records, or None if there are none for this account
+        """
+        try:
+            cache = _loads(self.scan_cache_path.read_bytes())
+            cached_account, records = cache['account'], cache['records']
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, KeyError, TypeError):
+            # Treat a damaged cache like a missing one: the caller rescans
+            self.logger.warning(f"Ignoring unreadable scan cache: {self.scan_cache_path}")
+            return None
+        
+        if cached_account != account:
+            # Another account's file IDs would resolve to the wrong downloads
+            self.logger.info(f"Ignoring scan cache of another account: {cached_account}")
+            return None
+        return records
+    
+    def set_scan_cache(self, account: str, records: Optional[List[List[Any]]]):
+        """Store scan records for reuse on the next run, or clear them with None.
+        
+        The records go to their own file right away instead of into every
+        snapshot, since they don't change until the next scan.
+        
+        Args:
+            account: Put.io username the records were scanned from
+            records: FileScanner.export_tree records, or None to clear the cache
+        """
+        if records is None:
+            self.scan_cache_path.unlink(missing_ok=True)
+            return
+        self._write_file(self.scan_cache_path, _dumps({'account': account, 'records': records}))
+        self.state.scan_completed = True
+        self.state.last_scan_time = _now_iso()
     
     def mark_file_completed(self, file_path: str, total_bytes: int):
         """Mark a file as successfully completed."""
-        self.state.files[file_path] = FileState(
+        file_state = FileState(
             file_path=file_path,
             total_bytes=total_bytes,
             downloaded_bytes=total_bytes,
             status="completed"
         )
+        self.state.files[file_path] = file_state
+        self._append_journal(file_state)
     
     def mark_file_failed(self, file_path: str, error_message: str):
         """Mark a file as failed with error information."""
@@ -135,24 +347,28 @@ class StateManager:
             file_state.status = "failed"
             file_state.error_message = error_message
             file_state.retry_count += 1
-            file_state.last_updated = datetime.now().isoformat()
+            file_state.last_updated = _now_iso()
         else:
-            self.state.files[file_path] = FileState(
+            file_state = FileState(
                 file_path=file_path,
                 total_bytes=0,
                 status="failed",
                 error_message=error_message,
                 retry_count=1
             )
+            self.state.files[file_path] = file_state
+        self._append_journal(file_state)
     
     def mark_file_in_progress(self, file_path: str, total_bytes: int, downloaded_bytes: int = 0):
         """Mark a file as currently being downloaded."""
-        self.state.files[file_path] = FileState(
+        file_state = FileState(
             file_path=file_path,
             total_bytes=total_bytes,
             downloaded_bytes=downloaded_bytes,
             status="in_progress"
         )
+        self.state.files[file_path] = file_state
+        self._append_journal(file_state)
     
     def get_completed_files(self) -> Dict[str, FileState]:
         """Get all files that have been completed."""
@@ -166,6 +382,10 @@ class StateManager:
         """Get all files currently in progress."""
         return {k: v for k, v in self.state.files.items() if v.status == "in_progress"}
     
+    def completed_paths(self) -> FrozenSet[str]:
+        """Get the paths of all completed files, for bulk membership checks."""
+        return frozenset(k for k, v in self.state.files.items() if v.status == "completed")
+    
     def is_file_completed(self, file_path: str) -> bool:
         """Check if a file has been completed."""
         return (file_path in self.state.files and 
@@ -174,9 +394,3 @@ class StateManager:
     def get_file_state(self, file_path: str) -> Optional[FileState]:
         """Get the state of a specific file."""
         return self.state.files.get(file_path)
-    
-    def _signal_handler(self, signum: int, frame):
-        """Handle signals for graceful shutdown."""
-        print(f"\nReceived signal {signum}. Saving state and shutting down gracefully...")
-        self.save_state()
-        exit(0)
\ No newline at end of file
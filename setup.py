@@ -6,14 +6,20 @@ setup(
     packages=find_packages(),
     install_requires=[
         "requests>=2.31.0",
-        "toml>=0.10.2",
+        # Python 3.11+ parses the config with the stdlib tomllib
+        "tomli>=1.1.0; python_version < '3.11'",
     ],
     extras_require={
+        "fast": [
+            "orjson>=3.0",
+        ],
         "dev": [
             "pytest>=7.4.0",
             "pytest-mock>=3.11.1",
             "pytest-cov>=4.1.0",
             "responses>=0.23.3",
+            # Writes TOML fixtures in tests
+            "toml>=0.10.2",
         ]
     },
     python_requires=">=3.8",
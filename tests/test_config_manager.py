@@ -1,10 +1,12 @@
 import pytest
 import tempfile
+import io
 import os
 from pathlib import Path
-from unittest.mock import patch, mock_open
+from unittest.mock import patch, MagicMock
 import toml
 
+from putio_migrator import config_manager
 from putio_migrator.config_manager import ConfigManager, ConfigValidationError
 
 
@@ -53,15 +55,8 @@ class TestConfigManager:
             }
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.toml', delete=False) as f:
-            toml.dump(config_data, f)
-            config_file = f.name
-        
-        try:
-            with pytest.raises(ConfigValidationError, match="OAuth token is required"):
-                ConfigManager(config_file)
-        finally:
-            os.unlink(config_file)
+        with pytest.raises(ConfigValidationError, match="OAuth token is required"):
+            ConfigManager.from_string(toml.dumps(config_data)).validate_all()
 
     def test_config_validation_fails_for_missing_destination(self):
         """Test validation fails when destination path is missing"""
@@ -71,15 +66,8 @@ class TestConfigManager:
             }
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.toml', delete=False) as f:
-            toml.dump(config_data, f)
-            config_file = f.name
-        
-        try:
-            with pytest.raises(ConfigValidationError, match="Destination base path is required"):
-                ConfigManager(config_file)
-        finally:
-            os.unlink(config_file)
+        with pytest.raises(ConfigValidationError, match="Destination base path is required"):
+            ConfigManager.from_string(toml.dumps(config_data)).validate_all()
 
     def test_config_creates_sample_when_missing(self):
         """Test sample config creation when file doesn't exist"""
@@ -97,6 +85,19 @@ class TestConfigManager:
                 # Verify sample config was created
                 assert Path(non_existent_file).exists()
 
+    def test_sample_config_template_covers_every_default(self):
+        """Test the literal sample template parses and stays in sync with DEFAULTS"""
+        sample = toml.loads(ConfigManager.SAMPLE_CONFIG)
+        
+        assert sample["putio"]["oauth_token"] == "YOUR_PUTIO_OAUTH_TOKEN_HERE"
+        assert sample["destination"]["base_path"] == "/path/to/your/nas/downloads"
+        for section, defaults in ConfigManager.DEFAULTS.items():
+            for key, default in defaults.items():
+                if default is None:
+                    # TOML has no null; unset options are left out of the sample
+                    continue
+                assert type(sample[section][key]) is type(default), f"{section}.{key}"
+
     def test_config_uses_defaults_for_optional_values(self):
         """Test that default values are used for optional configuration"""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -109,20 +110,14 @@ class TestConfigManager:
                 }
             }
             
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.toml', delete=False) as f:
-                toml.dump(config_data, f)
-                config_file = f.name
-            
-            try:
-                config = ConfigManager(config_file)
-                assert config.putio_api_base_url == "https://api.put.io/v2"
-                assert config.destination_preserve_structure is True
-                assert config.download_connections == 4
-                assert config.download_timeout == 30
-                assert config.download_retry_limit == 3
-                assert config.logging_level == "INFO"
-            finally:
-                os.unlink(config_file)
+            config = ConfigManager.from_string(toml.dumps(config_data))
+            assert config.putio_api_base_url == "https://api.put.io/v2"
+            assert config.destination_preserve_structure is True
+            assert config.download_connections == 4
+            assert config.download_timeout == 30
+            assert config.download_retry_limit == 3
+            assert config.download_verify_size is True
+            assert config.logging_level == "INFO"
 
     def test_config_validates_numeric_ranges(self):
         """Test validation of numeric configuration values"""
@@ -133,15 +128,12 @@ class TestConfigManager:
                 "download": {"connections": 0}  # Invalid: should be >= 1
             }
             
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.toml', delete=False) as f:
-                toml.dump(config_data, f)
-                config_file = f.name
-            
-            try:
+            # Only the [download] section is validated, when a value from it is first read
+            config = ConfigManager.from_string(toml.dumps(config_data))
+            with patch.object(config, '_validate_section', wraps=config._validate_section) as mock_validate:
                 with pytest.raises(ConfigValidationError, match="Download connections must be between 1 and 16"):
-                    ConfigManager(config_file)
-            finally:
-                os.unlink(config_file)
+                    config.download_connections
+            assert [c.args[0] for c in mock_validate.call_args_list] == ["download"]
 
     def test_config_validates_path_existence(self):
         """Test validation of destination path existence"""
@@ -150,12 +142,161 @@ class TestConfigManager:
             "destination": {"base_path": "/non/existent/path"}
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.toml', delete=False) as f:
-            toml.dump(config_data, f)
-            config_file = f.name
+        with pytest.raises(ConfigValidationError, match="Destination path does not exist"):
+            ConfigManager.from_string(toml.dumps(config_data)).validate_all()
+
+    def test_config_validates_scan_workers(self):
+        """Test validation of the scan concurrency setting"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_data = {
+                "putio": {"oauth_token": "test_token_123"},
+                "destination": {"base_path": temp_dir},
+                "advanced": {"scan_workers": 0}
+            }
+            
+            with pytest.raises(ConfigValidationError, match="Scan workers must be between 1 and 16"):
+                ConfigManager.from_string(toml.dumps(config_data)).validate_all()
+
+
+    @pytest.mark.parametrize("section, key, value, message", [
+        ("download", "connections", "4", "Download connections must be between 1 and 16"),
+        ("download", "connections", True, "Download connections must be between 1 and 16"),
+        ("download", "timeout", 0, "Download timeout must be positive"),
+        ("download", "retry_limit", 1.5, "Download retry limit must be non-negative"),
+        ("download", "concurrent_files", 0, "Concurrent downloads must be between 1 and 16"),
+        ("state", "save_frequency_seconds", -1, "State save frequency must be non-negative"),
+        ("advanced", "api_requests_per_second", 0, "API requests per second must be positive"),
+    ])
+    def test_config_rejects_invalid_value_types_and_ranges(self, section, key, value, message):
+        """Test every schema rule rejects wrong types as well as out-of-range values"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_data = {
+                "putio": {"oauth_token": "test_token_123"},
+                "destination": {"base_path": temp_dir},
+                section: {key: value}
+            }
+            
+            with pytest.raises(ConfigValidationError, match=message):
+                ConfigManager.from_string(toml.dumps(config_data)).validate_all()
+
+    @pytest.mark.parametrize("parser_name, binary_mode", [
+        ("tomllib", True),
+        ("tomli", True),
+        ("rtoml", False),
+        ("toml", False),
+    ])
+    def test_config_loads_with_each_parser_fallback(self, parser_name, binary_mode):
+        """Test tomllib/tomli parse the file bytes and the text parsers get one UTF-8 string"""
+        fake_parser = MagicMock(name=parser_name)
+        fake_parser.load.side_effect = lambda f: toml.loads(f.read().decode('utf-8'))
+        fake_parser.loads.side_effect = toml.loads
         
-        try:
-            with pytest.raises(ConfigValidationError, match="Destination path does not exist"):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = os.path.join(temp_dir, "config.toml")
+            with open(config_file, 'w', encoding='utf-8') as f:
+                toml.dump({
+                    "putio": {"oauth_token": "t\u00f6ken_123"},
+                    "destination": {"base_path": temp_dir}
+                }, f)
+            
+            with patch.object(config_manager, '_toml_parser', fake_parser), \
+                    patch.object(config_manager, '_TOML_BINARY_MODE', binary_mode):
+                config = ConfigManager(config_file)
+            
+            if binary_mode:
+                fake_parser.load.assert_called_once()
+                assert isinstance(fake_parser.load.call_args[0][0], io.BufferedIOBase)
+                fake_parser.loads.assert_not_called()
+            else:
+                fake_parser.loads.assert_called_once()
+                fake_parser.load.assert_not_called()
+            assert config.putio_oauth_token == "t\u00f6ken_123"
+
+    def test_config_rejects_invalid_toml(self):
+        """Test TOML syntax errors surface as ConfigValidationError"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = os.path.join(temp_dir, "config.toml")
+            with open(config_file, 'w') as f:
+                f.write("[putio\noauth_token = \n")
+            
+            with pytest.raises(ConfigValidationError, match="Invalid TOML"):
                 ConfigManager(config_file)
-        finally:
-            os.unlink(config_file)
\ No newline at end of file
+
+    def test_config_from_string_matches_file_loading(self):
+        """Test in-memory TOML gets the same defaults and validation as a file"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            text = toml.dumps({
+                "putio": {"oauth_token": "test_token_123"},
+                "destination": {"base_path": temp_dir}
+            })
+            config_file = os.path.join(temp_dir, "config.toml")
+            Path(config_file).write_text(text, encoding='utf-8')
+            
+            from_file = ConfigManager(config_file)
+            from_text = ConfigManager.from_string(text)
+            
+            assert from_text._raw_config == from_file._raw_config
+            assert from_text.download_connections == 4
+            from_text.validate_all()
+            
+            with pytest.raises(ConfigValidationError, match="Invalid TOML in inline.toml"):
+                ConfigManager.from_string("[putio\n", source="inline.toml")
+
+    def test_config_rejects_non_utf8_file(self):
+        """Test a config file that is not UTF-8 surfaces as ConfigValidationError"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = os.path.join(temp_dir, "config.toml")
+            with open(config_file, 'wb') as f:
+                f.write(b'[putio]\noauth_token = "t\xf6ken"\n')
+            
+            with pytest.raises(ConfigValidationError, match="Invalid TOML"):
+                ConfigManager(config_file)
+
+    def test_config_values_are_resolved_once_and_read_only(self):
+        """Test accessors return values cached on first access and reject assignment"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = os.path.join(temp_dir, "config.toml")
+            with open(config_file, 'w') as f:
+                toml.dump({
+                    "putio": {"oauth_token": "test_token_123"},
+                    "destination": {"base_path": temp_dir},
+                    "download": {"connections": 8}
+                }, f)
+            
+            config = ConfigManager(config_file)
+            assert config.download_connections == 8
+            # After the first read, each accessor returns a plain resolved field
+            assert vars(config)["_download_connections"] == 8
+            assert "_destination_base_path" not in vars(config)
+            
+            # Later changes to the raw data are not re-read
+            config._raw_config["download"]["connections"] = 2
+            assert config.download_connections == 8
+            
+            with pytest.raises(AttributeError):
+                config.download_connections = 2
+            with pytest.raises(AttributeError):
+                config.putio_oauth_token = "other_token"
+
+    def test_config_validates_sections_lazily(self):
+        """Test a section is only validated when one of its values is first used"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = os.path.join(temp_dir, "config.toml")
+            with open(config_file, 'w') as f:
+                toml.dump({
+                    "putio": {"oauth_token": "test_token_123"},
+                    "destination": {"base_path": os.path.join(temp_dir, "missing")},
+                    "download": {"connections": 99}
+                }, f)
+            
+            # Construction and unrelated sections do not touch the bad values
+            config = ConfigManager(config_file)
+            assert config.state_file_path == "migration_state.json"
+            assert config.putio_oauth_token == "test_token_123"
+            
+            with pytest.raises(ConfigValidationError, match="Destination path does not exist"):
+                config.destination_base_path
+            with pytest.raises(ConfigValidationError, match="Download connections must be between 1 and 16"):
+                config.download_connections
+            with pytest.raises(ConfigValidationError):
+                config.validate_all()
@@ -1,14 +1,31 @@
 import pytest
+import io
 import tempfile
 import os
+import signal
 import subprocess
+import sys
+import threading
+import time
+import requests
+import urllib3
 from pathlib import Path
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import patch, MagicMock
 
+from putio_migrator import download_manager as download_manager_module
 from putio_migrator.download_manager import DownloadManager, DownloadError, DownloadResult
 from putio_migrator.file_scanner import FileTreeNode
 
 
+# Successful Axel run; tests only read it, so one instance is shared
+AXEL_OK = subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr="")
+
+
+def make_file_node(name="test.txt", full_path=None, size=1024, file_id=123, parent_id=0):
+    """Build a file (never folder) node; the path defaults to the bare name."""
+    return FileTreeNode(name, file_id, size, False, parent_id, full_path or name)
+
+
 class TestDownloadManager:
     
     def test_download_manager_skips_existing_complete_files(self):
@@ -16,14 +33,7 @@ class TestDownloadManager:
         with tempfile.TemporaryDirectory() as temp_dir:
             download_manager = DownloadManager(destination_path=temp_dir)
             
-            file_node = FileTreeNode(
-                name="existing_file.txt",
-                file_id=123,
-                size=1024,
-                is_folder=False,
-                parent_id=0,
-                full_path="existing_file.txt"
-            )
+            file_node = make_file_node("existing_file.txt")
             
             # Create existing file with correct size
             existing_file = Path(temp_dir) / "existing_file.txt"
@@ -31,11 +41,14 @@ class TestDownloadManager:
             
             download_url = "https://download.put.io/files/existing_file.txt"
             
-            with patch('subprocess.run') as mock_run:
+            with patch.object(DownloadManager, '_run_axel') as mock_run, \
+                    patch.object(Path, 'mkdir') as mock_mkdir:
                 result = download_manager.download_file(file_node, download_url)
                 
-                # Should not call subprocess since file exists and is complete
+                # Should not call subprocess since file exists and is complete,
+                # and the one stat that proved it makes mkdir unnecessary
                 mock_run.assert_not_called()
+                mock_mkdir.assert_not_called()
                 assert result.success is True
                 assert result.already_existed is True
 
@@ -47,21 +60,12 @@ class TestDownloadManager:
                 preserve_structure=True
             )
             
-            file_node = FileTreeNode(
-                name="nested_file.txt",
-                file_id=123,
-                size=1024,
-                is_folder=False,
-                parent_id=456,
-                full_path="folder1/subfolder2/nested_file.txt"
-            )
+            file_node = make_file_node("nested_file.txt", "folder1/subfolder2/nested_file.txt", parent_id=456)
             
             download_url = "https://download.put.io/files/nested_file.txt"
             
-            with patch('subprocess.run') as mock_run:
-                mock_run.return_value = subprocess.CompletedProcess(
-                    args=[], returncode=0, stdout="", stderr=""
-                )
+            with patch.object(DownloadManager, '_run_axel') as mock_run:
+                mock_run.return_value = AXEL_OK
                 
                 # Create a small test file to simulate download
                 target_path = Path(temp_dir) / file_node.full_path
@@ -109,12 +113,38 @@ class TestDownloadManager:
         assert dm2.preserve_structure is False
         assert dm2.use_fallback is False
 
-    @patch('subprocess.run')
+    def test_fallback_downloads_share_one_session(self):
+        """Test fallback downloads reuse the pooled session and close() releases it"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            download_manager = DownloadManager(destination_path=temp_dir, connections=6,
+                                               concurrent_files=3)
+            adapter = download_manager.session.get_adapter("https://example.com/")
+            # Three files fetching six ranges each must all fit in the pool
+            assert adapter._pool_maxsize == 18
+            assert adapter.max_retries.total == 0
+            
+            def fake_get(url, **kwargs):
+                response = MagicMock()
+                response.raw = io.BytesIO(b"x" * 10)
+                response.__enter__.return_value = response
+                return response
+            
+            with patch.object(DownloadManager, '_run_axel', side_effect=FileNotFoundError("axel not found")):
+                with patch.object(download_manager.session, 'get', side_effect=fake_get) as mock_get:
+                    for i in range(3):
+                        node = FileTreeNode(f"f{i}.bin", i, 10, False, 0, f"f{i}.bin")
+                        assert download_manager.download_file(node, f"https://example.com/{i}").success
+            
+            assert mock_get.call_count == 3
+            
+            with patch.object(download_manager.session, 'close') as mock_close:
+                download_manager.close()
+                mock_close.assert_called_once()
+
+    @patch.object(DownloadManager, '_run_axel')
     def test_axel_command_parameters(self, mock_run):
         """Test that Axel is called with correct parameters"""
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=[], returncode=0, stdout="", stderr=""
-        )
+        mock_run.return_value = AXEL_OK
         
         with tempfile.TemporaryDirectory() as temp_dir:
             download_manager = DownloadManager(
@@ -123,20 +153,13 @@ class TestDownloadManager:
                 timeout=45
             )
             
-            file_node = FileTreeNode(
-                name="test.txt",
-                file_id=123,
-                size=1024,
-                is_folder=False,
-                parent_id=0,
-                full_path="test.txt"
-            )
+            file_node = make_file_node()
             
             # Simulate successful download by creating the file after Axel "runs"
             def create_file_side_effect(*args, **kwargs):
                 target_file = Path(temp_dir) / "test.txt"
                 target_file.write_bytes(b"x" * 1024)
-                return subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr="")
+                return AXEL_OK
             
             mock_run.side_effect = create_file_side_effect
             
@@ -150,48 +173,68 @@ class TestDownloadManager:
             assert "-T" in command and "45" in command
             assert "-o" in command
 
-    @patch('subprocess.run')
-    def test_download_manager_handles_subprocess_errors(self, mock_run):
-        """Test handling various subprocess errors"""
-        # Test FileNotFoundError (Axel not installed)
-        mock_run.side_effect = FileNotFoundError("axel: command not found")
-        
+    @pytest.mark.parametrize("error", [
+        FileNotFoundError("axel: command not found"),  # Axel not installed
+        subprocess.TimeoutExpired(cmd=["axel"], timeout=30),
+    ], ids=["axel-missing", "axel-timeout"])
+    def test_download_manager_handles_subprocess_errors(self, error):
+        """Test Axel launch failures and timeouts surface as DownloadError without fallback"""
         with tempfile.TemporaryDirectory() as temp_dir:
             download_manager = DownloadManager(destination_path=temp_dir, use_fallback=False)
             
-            file_node = FileTreeNode(
-                name="test.txt",
-                file_id=123,
-                size=1024,
-                is_folder=False,
-                parent_id=0,
-                full_path="test.txt"
-            )
+            file_node = make_file_node()
             
             # Since use_fallback=False, this should raise DownloadError
-            with pytest.raises(DownloadError, match="Axel download failed and fallback disabled"):
-                download_manager.download_file(file_node, "https://example.com/file.txt")
+            with patch.object(DownloadManager, '_run_axel', side_effect=error):
+                with pytest.raises(DownloadError, match="Axel download failed and fallback disabled"):
+                    download_manager.download_file(file_node, "https://example.com/file.txt")
 
-    @patch('subprocess.run')
-    def test_download_manager_handles_timeout(self, mock_run):
-        """Test handling download timeouts"""
-        mock_run.side_effect = subprocess.TimeoutExpired(cmd=["axel"], timeout=30)
-        
+    def test_interrupted_axel_does_not_fall_back(self):
+        """Test Axel killed by Ctrl+C during shutdown doesn't start a fallback download"""
         with tempfile.TemporaryDirectory() as temp_dir:
-            download_manager = DownloadManager(destination_path=temp_dir, use_fallback=False)
+            stopping = threading.Event()
+            download_manager = DownloadManager(destination_path=temp_dir, stop_event=stopping)
             
-            file_node = FileTreeNode(
-                name="test.txt",
-                file_id=123,
-                size=1024,
-                is_folder=False,
-                parent_id=0,
-                full_path="test.txt"
-            )
+            def interrupted_axel(command, **kwargs):
+                # Ctrl+C goes to the whole process group: the migration stops
+                # and Axel dies from the same SIGINT
+                stopping.set()
+                return subprocess.CompletedProcess(args=command, returncode=-signal.SIGINT)
             
-            # Since use_fallback=False, this should raise DownloadError
-            with pytest.raises(DownloadError, match="Axel download failed and fallback disabled"):
-                download_manager.download_file(file_node, "https://example.com/file.txt")
+            with patch.object(DownloadManager, '_run_axel', side_effect=interrupted_axel), \
+                    patch.object(download_manager.session, 'get') as mock_get:
+                result = download_manager.download_file(make_file_node(), "https://example.com/file.txt")
+            
+            assert result.success is False
+            assert result.error_message.startswith("Interrupted")
+            mock_get.assert_not_called()
+
+    def test_terminate_downloads_stops_running_axel(self):
+        """Test running Axel processes are terminated on request and late starters right away"""
+        sleeper = [sys.executable, "-c", "import time; time.sleep(30)"]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            stopping = threading.Event()
+            download_manager = DownloadManager(destination_path=temp_dir, stop_event=stopping)
+            results = []
+            runner = threading.Thread(target=lambda: results.append(
+                download_manager._run_axel(sleeper, timeout=60, stdout=subprocess.DEVNULL)))
+            runner.start()
+            
+            deadline = time.monotonic() + 5
+            while not download_manager._processes and time.monotonic() < deadline:
+                time.sleep(0.01)
+            download_manager.terminate_downloads()
+            runner.join(5)
+            
+            assert results[0].returncode == -signal.SIGTERM
+            assert not download_manager._processes
+            
+            # Started after stopping began: terminated without running to completion
+            stopping.set()
+            started = time.monotonic()
+            result = download_manager._run_axel(sleeper, timeout=60, stdout=subprocess.DEVNULL)
+            assert result.returncode == -signal.SIGTERM
+            assert time.monotonic() - started < 5
 
     def test_get_partial_download_size(self):
         """Test getting size of partially downloaded files"""
@@ -205,4 +248,318 @@ class TestDownloadManager:
             # Test existing partial file
             partial_file = Path(temp_dir) / "partial.txt"
             partial_file.write_bytes(b"x" * 512)
-            assert download_manager.get_partial_download_size(partial_file) == 512
\ No newline at end of file
+            with patch('os.stat', wraps=os.stat) as mock_stat:
+                assert download_manager.get_partial_download_size(partial_file) == 512
+            # One stat answers both "does it exist" and "how big is it"
+            assert mock_stat.call_count == 1
+
+    @patch.object(DownloadManager, '_run_axel')
+    def test_axel_resumes_only_when_partial_file_exists(self, mock_run):
+        """Test Axel gets -c only when a partial file is already on disk"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            download_manager = DownloadManager(destination_path=temp_dir)
+            
+            file_node = make_file_node()
+            target_file = Path(temp_dir) / "test.txt"
+            
+            def create_file_side_effect(*args, **kwargs):
+                target_file.write_bytes(b"x" * 1024)
+                return AXEL_OK
+            
+            mock_run.side_effect = create_file_side_effect
+            
+            download_manager.download_file(file_node, "https://example.com/file.txt")
+            assert "-c" not in mock_run.call_args[0][0]
+            
+            target_file.write_bytes(b"x" * 512)
+            result = download_manager.download_file(file_node, "https://example.com/file.txt")
+            assert "-c" in mock_run.call_args[0][0]
+            assert result.bytes_downloaded == 1024
+
+
+    @pytest.mark.parametrize("body, expect_success", [
+        (b"x" * 1024, True),
+        (b"x" * 1000, False),
+    ])
+    def test_fallback_streams_response_body_to_disk(self, body, expect_success):
+        """Test the fallback copies the raw stream and preallocation never hides short bodies"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            download_manager = DownloadManager(destination_path=temp_dir)
+            
+            file_node = make_file_node()
+            
+            mock_response = MagicMock()
+            mock_response.raw = io.BytesIO(body)
+            mock_response.__enter__.return_value = mock_response
+            
+            with patch.object(DownloadManager, '_run_axel', side_effect=FileNotFoundError("axel not found")):
+                with patch.object(download_manager.session, 'get', return_value=mock_response):
+                    if expect_success:
+                        result = download_manager.download_file(file_node, "https://example.com/file.txt")
+                        assert result.used_fallback is True
+                        assert result.bytes_downloaded == 1024
+                    else:
+                        with pytest.raises(DownloadError, match="expected 1024, got 1000"):
+                            download_manager.download_file(file_node, "https://example.com/file.txt")
+            
+            assert mock_response.raw.decode_content is True
+            # A short body never takes the target's name
+            target = Path(temp_dir) / "test.txt"
+            if expect_success:
+                assert target.read_bytes() == body
+            else:
+                assert not target.exists()
+            assert not (Path(temp_dir) / "test.txt.part").exists()
+
+    def test_fallback_broken_stream_is_downloaded_again_next_run(self):
+        """Test a stream that breaks partway leaves nothing a later run would skip as complete"""
+        class BrokenStream(io.BytesIO):
+            def read(self, size=-1):
+                if self.tell() >= 512:
+                    raise urllib3.exceptions.ProtocolError("Connection broken")
+                return super().read(min(size, 256) if size and size > 0 else 256)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            download_manager = DownloadManager(destination_path=temp_dir)
+            file_node = make_file_node()
+            target = Path(temp_dir) / "test.txt"
+            
+            broken = MagicMock()
+            broken.raw = BrokenStream(b"x" * 1024)
+            broken.__enter__.return_value = broken
+            
+            with patch.object(DownloadManager, '_run_axel', side_effect=FileNotFoundError("axel not found")), \
+                 patch.object(download_manager.session, 'get', return_value=broken):
+                with pytest.raises(DownloadError, match="Fallback download failed: Connection broken"):
+                    download_manager.download_file(file_node, "https://example.com/file.txt")
+            
+            assert not target.exists()
+            assert not (Path(temp_dir) / "test.txt.part").exists()
+            
+            complete = MagicMock()
+            complete.raw = io.BytesIO(b"y" * 1024)
+            complete.__enter__.return_value = complete
+            
+            with patch.object(DownloadManager, '_run_axel', side_effect=FileNotFoundError("axel not found")), \
+                 patch.object(download_manager.session, 'get', return_value=complete) as mock_get:
+                result = download_manager.download_file(file_node, "https://example.com/file.txt")
+            
+            assert result.already_existed is False
+            mock_get.assert_called_once()
+            assert target.read_bytes() == b"y" * 1024
+
+    def test_fallback_copies_in_bounded_chunks(self):
+        """Test the fallback never asks the stream for more than one chunk at a time"""
+        class RecordingStream(io.BytesIO):
+            def __init__(self, data):
+                super().__init__(data)
+                self.read_sizes = []
+            
+            def read(self, size=-1):
+                self.read_sizes.append(size)
+                return super().read(size)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            download_manager = DownloadManager(destination_path=temp_dir)
+            
+            file_node = make_file_node()
+            
+            mock_response = MagicMock()
+            mock_response.raw = RecordingStream(b"x" * 1024)
+            mock_response.__enter__.return_value = mock_response
+            
+            with patch('putio_migrator.download_manager.FALLBACK_CHUNK_SIZE', 64), \
+                 patch.object(DownloadManager, '_run_axel', side_effect=FileNotFoundError("axel not found")), \
+                 patch.object(download_manager.session, 'get', return_value=mock_response):
+                result = download_manager.download_file(file_node, "https://example.com/file.txt")
+            
+            assert result.bytes_downloaded == 1024
+            assert len(mock_response.raw.read_sizes) > 1
+            assert all(0 < size <= 64 for size in mock_response.raw.read_sizes)
+
+    @pytest.mark.parametrize("honor_ranges", [True, False])
+    def test_fallback_fetches_byte_ranges_concurrently(self, honor_ranges):
+        """Test large fallback downloads split into ranges, or use one stream if ranges are ignored"""
+        body = bytes(range(256)) * 4
+        requested_ranges = []
+        
+        def fake_get(url, **kwargs):
+            range_header = kwargs.get("headers", {}).get("Range")
+            requested_ranges.append(range_header)
+            response = MagicMock()
+            if honor_ranges and range_header:
+                start, end = (int(n) for n in range_header[len("bytes="):].split("-"))
+                response.status_code = 206
+                response.raw = io.BytesIO(body[start:end + 1])
+            else:
+                response.status_code = 200
+                response.raw = io.BytesIO(body)
+            response.__enter__.return_value = response
+            return response
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            download_manager = DownloadManager(destination_path=temp_dir, connections=4)
+            file_node = FileTreeNode("big.bin", 1, len(body), False, 0, "big.bin")
+            
+            with patch.object(download_manager_module, 'RANGED_MIN_PART_SIZE', 100), \
+                    patch.object(DownloadManager, '_run_axel', side_effect=FileNotFoundError("axel not found")), \
+                    patch.object(download_manager.session, 'get', side_effect=fake_get):
+                result = download_manager.download_file(file_node, "https://example.com/big.bin")
+            
+            assert result.success and result.used_fallback
+            assert (Path(temp_dir) / "big.bin").read_bytes() == body
+            if honor_ranges:
+                assert sorted(requested_ranges) == [
+                    "bytes=0-255", "bytes=256-511", "bytes=512-767", "bytes=768-1023"
+                ]
+            else:
+                assert requested_ranges == ["bytes=0-255"]
+
+    def test_fallback_rejects_short_range_response(self):
+        """Test a truncated range body fails instead of leaving a hole in the preallocated file"""
+        def fake_get(url, **kwargs):
+            response = MagicMock()
+            response.status_code = 206
+            response.raw = io.BytesIO(b"x" * 10)
+            response.__enter__.return_value = response
+            return response
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            download_manager = DownloadManager(destination_path=temp_dir, connections=2)
+            file_node = FileTreeNode("big.bin", 1, 400, False, 0, "big.bin")
+            
+            with patch.object(download_manager_module, 'RANGED_MIN_PART_SIZE', 100), \
+                    patch.object(DownloadManager, '_run_axel', side_effect=FileNotFoundError("axel not found")), \
+                    patch.object(download_manager.session, 'get', side_effect=fake_get):
+                with pytest.raises(DownloadError, match="ended early: got 10 of 200 bytes"):
+                    download_manager.download_file(file_node, "https://example.com/big.bin")
+            
+            # The preallocated, partly written file never takes the target's name
+            assert not (Path(temp_dir) / "big.bin").exists()
+            assert not (Path(temp_dir) / "big.bin.part").exists()
+
+    def test_fallback_failed_later_range_is_not_treated_as_complete(self):
+        """Test a range failing after a successful 206 probe leaves nothing the next run would skip"""
+        body = bytes(range(256)) * 4
+        
+        def fake_get(url, **kwargs):
+            start, end = (int(n) for n in kwargs["headers"]["Range"][len("bytes="):].split("-"))
+            if start > 0:
+                raise requests.exceptions.ConnectionError("Connection reset")
+            response = MagicMock()
+            response.status_code = 206
+            response.raw = io.BytesIO(body[start:end + 1])
+            response.__enter__.return_value = response
+            return response
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            download_manager = DownloadManager(destination_path=temp_dir, connections=4)
+            file_node = FileTreeNode("big.bin", 1, len(body), False, 0, "big.bin")
+            
+            with patch.object(download_manager_module, 'RANGED_MIN_PART_SIZE', 100), \
+                    patch.object(DownloadManager, '_run_axel', side_effect=FileNotFoundError("axel not found")), \
+                    patch.object(download_manager.session, 'get', side_effect=fake_get):
+                with pytest.raises(DownloadError, match="Fallback download failed: Connection reset"):
+                    download_manager.download_file(file_node, "https://example.com/big.bin")
+            
+            assert not (Path(temp_dir) / "big.bin").exists()
+            assert not (Path(temp_dir) / "big.bin.part").exists()
+            
+            def fake_axel(command, **kwargs):
+                Path(command[command.index("-o") + 1]).write_bytes(body)
+                return AXEL_OK
+            
+            with patch.object(DownloadManager, '_run_axel', side_effect=fake_axel) as mock_run:
+                result = download_manager.download_file(file_node, "https://example.com/big.bin")
+            
+            # Axel is asked to fetch the file again from scratch
+            assert result.already_existed is False
+            mock_run.assert_called_once()
+            assert "-c" not in mock_run.call_args[0][0]
+
+    def test_fallback_failed_range_stops_the_other_ranges(self):
+        """Test the first failing range stops the others instead of waiting for them to finish"""
+        body = bytes(range(256)) * 4
+        served = []
+        
+        class SlowBody:
+            """Range body that trickles out 8 bytes at a time."""
+            def __init__(self, data):
+                self.data = io.BytesIO(data)
+            
+            def read(self, size):
+                time.sleep(0.01)
+                chunk = self.data.read(min(size, 8))
+                served.append(len(chunk))
+                return chunk
+        
+        def fake_get(url, **kwargs):
+            start, end = (int(n) for n in kwargs["headers"]["Range"][len("bytes="):].split("-"))
+            if start == 512:
+                raise requests.exceptions.ConnectionError("Connection reset")
+            response = MagicMock()
+            response.status_code = 206
+            response.raw = SlowBody(body[start:end + 1])
+            response.__enter__.return_value = response
+            return response
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            download_manager = DownloadManager(destination_path=temp_dir, connections=4)
+            file_node = FileTreeNode("big.bin", 1, len(body), False, 0, "big.bin")
+            
+            with patch.object(download_manager_module, 'RANGED_MIN_PART_SIZE', 100), \
+                    patch.object(DownloadManager, '_run_axel', side_effect=FileNotFoundError("axel not found")), \
+                    patch.object(download_manager.session, 'get', side_effect=fake_get):
+                with pytest.raises(DownloadError, match="Fallback download failed: Connection reset"):
+                    download_manager.download_file(file_node, "https://example.com/big.bin")
+            
+            # Three healthy 256-byte ranges would serve 768 bytes if left to finish
+            assert sum(served) < 256
+            assert not (Path(temp_dir) / "big.bin.part").exists()
+
+    def test_axel_output_is_spooled_and_tail_reported(self):
+        """Test Axel output goes to a temporary file and only its tail reaches the error"""
+        def failing_axel(command, **kwargs):
+            assert "capture_output" not in kwargs
+            assert kwargs["stderr"] == subprocess.STDOUT
+            kwargs["stdout"].write(b"." * 10000 + b"\nHTTP/1.1 404 Not Found\n")
+            return subprocess.CompletedProcess(args=command, returncode=1)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            download_manager = DownloadManager(destination_path=temp_dir, use_fallback=False)
+            file_node = FileTreeNode("test.txt", 1, 1024, False, 0, "test.txt")
+            
+            with patch.object(DownloadManager, '_run_axel', side_effect=failing_axel):
+                with pytest.raises(DownloadError) as exc_info:
+                    download_manager.download_file(file_node, "https://example.com/file.txt")
+            
+            message = str(exc_info.value)
+            assert "code 1" in message
+            assert message.endswith("HTTP/1.1 404 Not Found")
+            assert len(message) < download_manager_module.AXEL_OUTPUT_TAIL + 200
+
+    @pytest.mark.parametrize("verify_size", [True, False])
+    def test_axel_success_size_check_can_be_disabled(self, verify_size):
+        """Test verify_size=False trusts Axel's exit status and skips the post-download stat"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            download_manager = DownloadManager(destination_path=temp_dir, verify_size=verify_size)
+            file_node = FileTreeNode("test.txt", 1, 1024, False, 0, "test.txt")
+            
+            def axel_writes_short_file(command, **kwargs):
+                (Path(temp_dir) / "test.txt").write_bytes(b"x" * 1000)
+                return subprocess.CompletedProcess(args=command, returncode=0)
+            
+            with patch.object(DownloadManager, '_run_axel', side_effect=axel_writes_short_file), \
+                    patch.object(download_manager, '_get_downloaded_size',
+                                 wraps=download_manager._get_downloaded_size) as mock_size:
+                if verify_size:
+                    # The mismatch sends the file to the fallback path
+                    with patch.object(download_manager, '_download_with_requests',
+                                      side_effect=DownloadError("fallback")):
+                        with pytest.raises(DownloadError, match="fallback"):
+                            download_manager.download_file(file_node, "https://example.com/file.txt")
+                    mock_size.assert_called_once()
+                else:
+                    result = download_manager.download_file(file_node, "https://example.com/file.txt")
+                    assert result.success and result.bytes_downloaded == 1024
+                    mock_size.assert_not_called()
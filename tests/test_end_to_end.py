@@ -6,9 +6,15 @@ import toml
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
+from putio_migrator.download_manager import DownloadManager
 from putio_migrator.main import MigrationOrchestrator
 
 
+def axel_output_file(command):
+    """Return the path passed to Axel's -o option."""
+    return command[command.index("-o") + 1]
+
+
 class TestEndToEnd:
     
     @responses.activate
@@ -68,7 +74,7 @@ class TestEndToEnd:
             # Music folder listing
             responses.add(
                 responses.GET,
-                "https://api.put.io/v2/files/list?parent_id=2",
+                "https://api.put.io/v2/files/list?parent_id=2&per_page=1000",
                 json={
                     "files": [
                         {"id": 3, "name": "song.mp3", "file_type": "AUDIO", "size": 512, "parent_id": 2}
@@ -95,26 +101,20 @@ class TestEndToEnd:
             
             # Mock Axel downloads to create files
             def mock_axel_download(*args, **kwargs):
-                command = args[0]
-                output_file = None
-                for i, arg in enumerate(command):
-                    if arg == "-o" and i + 1 < len(command):
-                        output_file = command[i + 1]
-                        break
+                output_file = axel_output_file(args[0])
                 
-                if output_file:
-                    output_path = Path(output_file)
-                    output_path.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    # Create file with appropriate content based on name
-                    if "movie.mp4" in output_file:
-                        output_path.write_bytes(b"x" * 1024)
-                    elif "song.mp3" in output_file:
-                        output_path.write_bytes(b"x" * 512)
+                # DownloadManager has already created the target's folder
+                output_path = Path(output_file)
+                
+                # Create file with appropriate content based on name
+                if "movie.mp4" in output_file:
+                    output_path.write_bytes(b"x" * 1024)
+                elif "song.mp3" in output_file:
+                    output_path.write_bytes(b"x" * 512)
                 
                 return MagicMock(returncode=0, stdout="", stderr="")
             
-            with patch('subprocess.run', side_effect=mock_axel_download):
+            with patch.object(DownloadManager, '_run_axel', side_effect=mock_axel_download):
                 # Run migration
                 orchestrator = MigrationOrchestrator(config_file)
                 result = orchestrator.run_migration()
@@ -193,12 +193,7 @@ class TestEndToEnd:
             def mock_axel_first_run(*args, **kwargs):
                 nonlocal download_call_count
                 download_call_count += 1
-                command = args[0]
-                output_file = None
-                for i, arg in enumerate(command):
-                    if arg == "-o" and i + 1 < len(command):
-                        output_file = command[i + 1]
-                        break
+                output_file = axel_output_file(args[0])
                 
                 if download_call_count == 1 and "file1.txt" in output_file:
                     # First file succeeds
@@ -208,7 +203,7 @@ class TestEndToEnd:
                     # Second file fails
                     return MagicMock(returncode=1, stderr="Network error")
             
-            with patch('subprocess.run', side_effect=mock_axel_first_run):
+            with patch.object(DownloadManager, '_run_axel', side_effect=mock_axel_first_run):
                 orchestrator1 = MigrationOrchestrator(config_file)
                 result1 = orchestrator1.run_migration()
                 
@@ -217,12 +212,7 @@ class TestEndToEnd:
             
             # Second migration: Resume and complete second file
             def mock_axel_second_run(*args, **kwargs):
-                command = args[0]
-                output_file = None
-                for i, arg in enumerate(command):
-                    if arg == "-o" and i + 1 < len(command):
-                        output_file = command[i + 1]
-                        break
+                output_file = axel_output_file(args[0])
                 
                 if "file2.txt" in output_file:
                     # Second file now succeeds
@@ -231,7 +221,7 @@ class TestEndToEnd:
                 
                 return MagicMock(returncode=0)
             
-            with patch('subprocess.run', side_effect=mock_axel_second_run):
+            with patch.object(DownloadManager, '_run_axel', side_effect=mock_axel_second_run):
                 orchestrator2 = MigrationOrchestrator(config_file)
                 result2 = orchestrator2.run_migration()
                 
@@ -1,8 +1,12 @@
 import pytest
+import sys
+import threading
+import time
 from unittest.mock import MagicMock, patch
 from dataclasses import dataclass
 from typing import List, Dict, Any
 
+from putio_migrator.download_manager import DownloadResult
 from putio_migrator.file_scanner import FileScanner, FileTreeNode, ScanProgress
 from putio_migrator.putio_client import PutioClient
 
@@ -189,4 +193,288 @@ class TestFileScanner:
         assert len(all_files) == 2
         file_names = [f.name for f in all_files]
         assert "root_file.txt" in file_names
-        assert "nested_file.txt" in file_names
\ No newline at end of file
+        assert "nested_file.txt" in file_names
+
+    def test_scanner_allows_extensions_case_insensitively(self):
+        """Test allowed extensions match regardless of case"""
+        mock_client = MagicMock(spec=PutioClient)
+        mock_client.list_files.return_value = {
+            "files": [
+                {"id": 1, "name": "movie.mkv", "file_type": "VIDEO", "size": 1024, "parent_id": 0},
+                {"id": 2, "name": "clip.Mp4", "file_type": "VIDEO", "size": 2048, "parent_id": 0},
+                {"id": 3, "name": "notes.txt", "file_type": "TEXT", "size": 512, "parent_id": 0},
+                {"id": 4, "name": "mkv", "file_type": "FILE", "size": 256, "parent_id": 0}
+            ],
+            "parent": {"id": 0}
+        }
+        
+        scanner = FileScanner(mock_client, file_filters={"allowed_extensions": ["MKV", "mp4"]})
+        scanner.scan_account()
+        
+        file_names = [f.name for f in scanner.get_all_files()]
+        assert file_names == ["movie.mkv", "clip.Mp4"]
+
+    def test_scanner_blocks_extensions_case_insensitively(self):
+        """Test blocked extensions match regardless of case"""
+        mock_client = MagicMock(spec=PutioClient)
+        mock_client.list_files.return_value = {
+            "files": [
+                {"id": 1, "name": "movie.MKV", "file_type": "VIDEO", "size": 1024, "parent_id": 0},
+                {"id": 2, "name": "download.Part", "file_type": "FILE", "size": 2048, "parent_id": 0},
+                {"id": 3, "name": "README", "file_type": "TEXT", "size": 512, "parent_id": 0}
+            ],
+            "parent": {"id": 0}
+        }
+        
+        scanner = FileScanner(mock_client, file_filters={"blocked_extensions": ["PART", "tmp"]})
+        scanner.scan_account()
+        
+        file_names = [f.name for f in scanner.get_all_files()]
+        assert file_names == ["movie.MKV", "README"]
+
+
+    def test_scanner_keeps_depth_first_order(self):
+        """Test files and progress are reported in depth-first order"""
+        listings = {
+            0: [
+                {"id": 1, "name": "a.txt", "file_type": "VIDEO", "size": 1, "parent_id": 0},
+                {"id": 2, "name": "first", "file_type": "FOLDER", "size": 0, "parent_id": 0},
+                {"id": 3, "name": "second", "file_type": "FOLDER", "size": 0, "parent_id": 0},
+                {"id": 4, "name": "z.txt", "file_type": "VIDEO", "size": 1, "parent_id": 0}
+            ],
+            2: [
+                {"id": 5, "name": "b.txt", "file_type": "VIDEO", "size": 1, "parent_id": 2},
+                {"id": 6, "name": "deep", "file_type": "FOLDER", "size": 0, "parent_id": 2}
+            ],
+            3: [{"id": 7, "name": "d.txt", "file_type": "VIDEO", "size": 1, "parent_id": 3}],
+            6: [{"id": 8, "name": "c.txt", "file_type": "VIDEO", "size": 1, "parent_id": 6}]
+        }
+        mock_client = MagicMock(spec=PutioClient)
+        mock_client.list_files.side_effect = lambda parent_id: {"files": listings[parent_id]}
+        
+        scanner = FileScanner(mock_client, max_workers=4)
+        folders_entered = []
+        
+        def progress_callback(progress: ScanProgress):
+            if len(folders_entered) < progress.folders_scanned:
+                folders_entered.append(progress.current_folder)
+        
+        scanner.scan_account(progress_callback=progress_callback)
+        
+        assert [f.full_path for f in scanner.get_all_files()] == [
+            "a.txt", "first/b.txt", "first/deep/c.txt", "second/d.txt", "z.txt"
+        ]
+        assert folders_entered == ["/", "first", "first/deep", "second"]
+
+    def test_scanner_terminates_on_self_referencing_listing(self):
+        """Test a folder listing that contains itself does not loop forever"""
+        mock_client = MagicMock(spec=PutioClient)
+        mock_client.list_files.return_value = {
+            "files": [
+                {"id": 1, "name": "file1.txt", "file_type": "VIDEO", "size": 1024, "parent_id": 0},
+                {"id": 2, "name": "loop", "file_type": "FOLDER", "size": 0, "parent_id": 0}
+            ],
+            "parent": {"id": 0}
+        }
+        
+        scanner = FileScanner(mock_client)
+        tree = scanner.scan_account()
+        
+        loop_folder = next(child for child in tree.children if child.name == "loop")
+        assert [child.name for child in loop_folder.children] == ["file1.txt"]
+        assert mock_client.list_files.call_count == 2
+        assert scanner.get_file_count() == 2
+
+    def test_scanner_failed_listing_keeps_sibling_folders(self):
+        """Test one failing folder listing does not affect its siblings"""
+        def list_files(parent_id):
+            if parent_id == 0:
+                return {"files": [
+                    {"id": 10, "name": "a", "file_type": "FOLDER", "size": 0, "parent_id": 0},
+                    {"id": 20, "name": "b", "file_type": "FOLDER", "size": 0, "parent_id": 0},
+                    {"id": 30, "name": "c", "file_type": "FOLDER", "size": 0, "parent_id": 0}
+                ]}
+            if parent_id == 20:
+                raise Exception("API error accessing folder")
+            return {"files": [
+                {"id": parent_id + 1, "name": "file.txt", "file_type": "VIDEO", "size": 100, "parent_id": parent_id}
+            ]}
+        
+        mock_client = MagicMock(spec=PutioClient)
+        mock_client.list_files.side_effect = list_files
+        
+        scanner = FileScanner(mock_client, max_workers=3)
+        tree = scanner.scan_account()
+        
+        children = {child.name: child for child in tree.children}
+        assert len(children["a"].children) == 1
+        assert len(children["b"].children) == 0
+        assert len(children["c"].children) == 1
+        assert [f.full_path for f in scanner.get_all_files()] == ["a/file.txt", "c/file.txt"]
+
+    def test_scanner_honors_max_workers(self):
+        """Test folder listings run concurrently but never exceed max_workers"""
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+        
+        def list_files(parent_id):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            if parent_id == 0:
+                return {"files": [
+                    {"id": i, "name": f"folder{i}", "file_type": "FOLDER", "size": 0, "parent_id": 0}
+                    for i in range(1, 9)
+                ]}
+            return {"files": []}
+        
+        mock_client = MagicMock(spec=PutioClient)
+        mock_client.list_files.side_effect = list_files
+        
+        scanner = FileScanner(mock_client, max_workers=3)
+        tree = scanner.scan_account()
+        
+        assert len(tree.children) == 8
+        assert mock_client.list_files.call_count == 9
+        assert 1 < peak <= 3
+
+    def test_scanner_interrupt_skips_queued_listings(self):
+        """Test an interrupted scan returns without listing the folders still queued"""
+        def list_files(parent_id):
+            if parent_id == 0:
+                return {"files": [
+                    {"id": i, "name": f"folder{i}", "file_type": "FOLDER", "size": 0, "parent_id": 0}
+                    for i in range(1, 21)
+                ]}
+            time.sleep(0.02)
+            return {"files": []}
+        
+        def progress_callback(progress):
+            # Entering the first subfolder; the other 19 listings are still queued
+            if progress.folders_scanned == 2:
+                raise KeyboardInterrupt
+        
+        mock_client = MagicMock(spec=PutioClient)
+        mock_client.list_files.side_effect = list_files
+        
+        scanner = FileScanner(mock_client, max_workers=1)
+        with pytest.raises(KeyboardInterrupt):
+            scanner.scan_account(progress_callback)
+        
+        time.sleep(0.1)
+        assert mock_client.list_files.call_count <= 3
+
+    def test_scanner_throttles_file_progress_updates(self):
+        """Test file progress is reported every progress_interval files plus a final update"""
+        mock_client = MagicMock(spec=PutioClient)
+        mock_client.list_files.return_value = {
+            "files": [
+                {"id": i, "name": f"file{i}.txt", "file_type": "VIDEO", "size": 10, "parent_id": 0}
+                for i in range(1, 6)
+            ],
+            "parent": {"id": 0}
+        }
+        
+        scanner = FileScanner(mock_client, progress_interval=2)
+        reported_counts = []
+        scanner.scan_account(progress_callback=lambda p: reported_counts.append(p.files_discovered))
+        
+        # Every second file, then the final totals; one folder is below the interval
+        assert reported_counts == [2, 4, 5]
+
+    def test_scanner_throttles_folder_progress_updates(self):
+        """Test entering folders is throttled like discovering files"""
+        def list_files(parent_id):
+            if parent_id == 0:
+                return {"files": [
+                    {"id": i, "name": f"folder{i}", "file_type": "FOLDER", "size": 0, "parent_id": 0}
+                    for i in range(1, 51)
+                ]}
+            return {"files": [
+                {"id": 1000 + parent_id, "name": "file.txt", "file_type": "VIDEO", "size": 10,
+                 "parent_id": parent_id}
+            ]}
+        
+        mock_client = MagicMock(spec=PutioClient)
+        mock_client.list_files.side_effect = list_files
+        
+        scanner = FileScanner(mock_client, progress_interval=20)
+        reported = []
+        scanner.scan_account(progress_callback=lambda p: reported.append(
+            (p.folders_scanned, p.files_discovered)))
+        
+        # 51 folders and 50 files: two updates each, then the final totals
+        assert reported == [(20, 18), (21, 20), (40, 38), (41, 40), (51, 50)]
+
+    def test_scanner_exported_tree_reloads_without_api_calls(self):
+        """Test export_tree/load_tree round-trip the scan and apply the current filters"""
+        mock_client = MagicMock()
+        mock_client.list_files.side_effect = lambda folder_id: {
+            0: {"files": [
+                {"id": 1, "name": "movie.mkv", "size": 700, "file_type": "VIDEO", "parent_id": 0},
+                {"id": 2, "name": "shows", "size": 0, "file_type": "FOLDER", "parent_id": 0},
+            ]},
+            2: {"files": [
+                {"id": 3, "name": "ep1.mkv", "size": 300, "file_type": "VIDEO", "parent_id": 2},
+                {"id": 4, "name": "ep1.part", "size": 50, "file_type": "FILE", "parent_id": 2},
+            ]},
+        }[folder_id]
+        
+        scanner = FileScanner(mock_client)
+        records = scanner.export_tree(scanner.scan_account())
+        assert records == [
+            [1, 0, "movie.mkv", 700, False],
+            [2, 0, "shows", 0, True],
+            [3, 2, "ep1.mkv", 300, False],
+            [4, 2, "ep1.part", 50, False],
+        ]
+        
+        mock_client.list_files.reset_mock()
+        reloaded = FileScanner(mock_client, file_filters={"blocked_extensions": ["part"]})
+        root = reloaded.load_tree(records)
+        
+        mock_client.list_files.assert_not_called()
+        assert [c.name for c in root.children] == ["movie.mkv", "shows"]
+        assert [f.full_path for f in reloaded.get_all_files()] == ["movie.mkv", "shows/ep1.mkv"]
+        assert reloaded.get_total_size() == 1000
+
+    def test_scanner_never_filters_folders(self):
+        """Test folders skip the file filters even when their name or size would fail them"""
+        mock_client = MagicMock()
+        mock_client.list_files.side_effect = lambda folder_id: {
+            0: {"files": [
+                {"id": 1, "name": "backup.tmp", "size": 10 * 1024 ** 3, "file_type": "FOLDER", "parent_id": 0},
+            ]},
+            1: {"files": [
+                {"id": 2, "name": "movie.mkv", "size": 100, "file_type": "VIDEO", "parent_id": 1},
+                {"id": 3, "name": "movie.tmp", "size": 100, "file_type": "FILE", "parent_id": 1},
+                {"id": 4, "name": "huge.mkv", "size": 2 * 1024 ** 3, "file_type": "VIDEO", "parent_id": 1},
+            ]},
+        }[folder_id]
+        
+        scanner = FileScanner(mock_client, file_filters={
+            "allowed_extensions": ["mkv"],
+            "blocked_extensions": ["tmp"],
+            "max_file_size_gb": 1,
+        })
+        root = scanner.scan_account()
+        
+        assert [c.name for c in root.children] == ["backup.tmp"]
+        assert [f.full_path for f in scanner.get_all_files()] == ["backup.tmp/movie.mkv"]
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+    def test_tree_nodes_and_results_use_slots(self):
+        """Test per-node records drop the instance __dict__ and keep their defaults"""
+        node = FileTreeNode("a.txt", 1, 10, False, 0, "a.txt")
+        assert node.children == []
+        assert FileTreeNode("b", 2, 0, True, 0).children is not node.children
+        
+        for instance in (node, ScanProgress(), DownloadResult(success=True, file_path="a.txt")):
+            assert not hasattr(instance, "__dict__")
+            with pytest.raises(AttributeError):
+                instance.unexpected_attribute = 1
@@ -63,7 +63,7 @@ class TestIntegration:
         
         responses.add(
             responses.GET,
-            "https://api.put.io/v2/files/list?parent_id=2",
+            "https://api.put.io/v2/files/list?parent_id=2&per_page=1000",
             json={
                 "files": [
                     {"id": 3, "name": "nested_file.txt", "file_type": "VIDEO", "size": 2048, "parent_id": 2}
@@ -111,7 +111,7 @@ class TestIntegration:
             target_path = Path(temp_dir) / test_file.name
             target_path.write_bytes(b"x" * 1024)
             
-            with patch('subprocess.run') as mock_run:
+            with patch.object(DownloadManager, '_run_axel') as mock_run:
                 mock_run.return_value = MagicMock(returncode=0)
                 
                 result = download_manager.download_file(test_file, "https://example.com/file.txt")
@@ -147,7 +147,7 @@ class TestIntegration:
             target_file = Path(temp_dir) / file_node.name
             target_file.write_bytes(b"x" * 1024)
             
-            with patch('subprocess.run') as mock_run:
+            with patch.object(DownloadManager, '_run_axel') as mock_run:
                 mock_run.return_value = MagicMock(returncode=0)
                 
                 result = download_manager.download_file(file_node, "https://example.com/file.txt")
@@ -181,8 +181,9 @@ class TestIntegration:
         client = PutioClient("test_token", retry_limit=1)
         scanner = FileScanner(client)
         
-        # Should successfully scan after retry
-        file_tree = scanner.scan_account()
+        # Should successfully scan after retry; the backoff is not waited out
+        with patch('time.sleep'):
+            file_tree = scanner.scan_account()
         assert file_tree.name == "root"
         assert len(file_tree.children) == 0
 
@@ -251,7 +252,7 @@ class TestIntegration:
             with open(partial_file, 'ab') as f:
                 f.write(b"y" * 1024)  # Complete file to 2048 bytes
             
-            with patch('subprocess.run') as mock_run:
+            with patch.object(DownloadManager, '_run_axel') as mock_run:
                 mock_run.return_value = MagicMock(returncode=0)
                 
                 result = download_manager.download_file(file_node, "https://example.com/file.txt")
@@ -1,9 +1,13 @@
 import pytest
 import tempfile
 import os
+import signal
+import threading
+import time
 from unittest.mock import patch, MagicMock
 from pathlib import Path
 
+from putio_migrator.config_manager import ConfigValidationError
 from putio_migrator.main import MigrationOrchestrator, main
 from putio_migrator.file_scanner import FileTreeNode
 
@@ -35,15 +39,41 @@ base_path = "/tmp"
                         mock_config.putio_api_base_url = "https://api.put.io/v2"
                         mock_config.download_retry_limit = 3
                         mock_config.logging_level = "INFO"
+                        mock_config.scan_workers = 4
+                        mock_config.download_concurrent_files = 6
                         mock_config_class.return_value = mock_config
                         
                         orchestrator = MigrationOrchestrator(config_file)
                         
                         assert orchestrator.config_path == config_file
                         mock_config_class.assert_called_once_with(config_file)
+                        mock_config.validate_all.assert_called_once()
+                        # One pooled API connection per concurrent scan or download worker
+                        assert mock_client_class.call_args.kwargs["pool_size"] == 6
         finally:
             os.unlink(config_file)
 
+    @pytest.mark.parametrize("dry_run", [False, True])
+    def test_orchestrator_checks_destination_before_scanning(self, dry_run):
+        """Test a missing base_path fails at startup, except for dry runs that never download"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = os.path.join(temp_dir, "config.toml")
+            Path(config_file).write_text(
+                '[putio]\noauth_token = "test_token"\n\n'
+                f'[destination]\nbase_path = "{temp_dir}/missing"\n\n'
+                f'[state]\nfile_path = "{temp_dir}/state.json"\n'
+            )
+            
+            with patch('putio_migrator.main.PutioClient'), \
+                    patch('putio_migrator.main.FileScanner') as mock_scanner_class:
+                if dry_run:
+                    MigrationOrchestrator(config_file, dry_run=True)
+                else:
+                    with pytest.raises(ConfigValidationError, match="Destination path does not exist"):
+                        MigrationOrchestrator(config_file)
+                
+                mock_scanner_class.assert_not_called()
+
     def test_orchestrator_performs_full_migration_workflow(self):
         """Test complete migration workflow orchestration"""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -59,18 +89,13 @@ base_path = "/tmp"
             mock_config.download_connections = 4
             mock_config.download_timeout = 30
             mock_config.destination_preserve_structure = True
-            mock_config.state_file_path = "test_state.json"
-            mock_config.state_save_frequency = 30
-            mock_config.putio_api_base_url = "https://api.put.io/v2"
-            mock_config.download_retry_limit = 3
-            mock_config.logging_level = "INFO"
-            mock_config.download_connections = 4
-            mock_config.download_timeout = 30
-            mock_config.destination_preserve_structure = True
+            mock_config.download_concurrent_files = 1
+            mock_config.download_verify_size = False
+            mock_config.scan_workers = 4
             
             mock_state = MagicMock()
             mock_state.get_completed_files.return_value = {}
-            mock_state.is_file_completed.return_value = False
+            mock_state.completed_paths.return_value = frozenset()
             
             mock_client = MagicMock()
             mock_client.get_account_info.return_value = {"info": {"username": "testuser"}}
@@ -94,7 +119,8 @@ base_path = "/tmp"
                 with patch('putio_migrator.main.StateManager', return_value=mock_state):
                     with patch('putio_migrator.main.PutioClient', return_value=mock_client):
                         with patch('putio_migrator.main.FileScanner', return_value=mock_scanner):
-                            with patch('putio_migrator.main.DownloadManager', return_value=mock_download_manager):
+                            with patch('putio_migrator.main.DownloadManager',
+                                       return_value=mock_download_manager) as mock_download_manager_class:
                                 orchestrator = MigrationOrchestrator("test_config.toml")
                                 result = orchestrator.run_migration()
                                 
@@ -102,6 +128,10 @@ base_path = "/tmp"
                                 mock_scanner.scan_account.assert_called_once()
                                 assert mock_download_manager.download_file.call_count == 2
                                 assert result["success"] is True
+                                mock_download_manager.close.assert_called_once()
+                                mock_client.close.assert_called_once()
+                                assert mock_download_manager_class.call_args.kwargs["verify_size"] is False
+                                assert mock_download_manager_class.call_args.kwargs["concurrent_files"] == 1
 
     def test_orchestrator_skips_completed_files(self):
         """Test that orchestrator skips files already marked as completed"""
@@ -117,19 +147,13 @@ base_path = "/tmp"
             mock_config.download_connections = 4
             mock_config.download_timeout = 30
             mock_config.destination_preserve_structure = True
-            mock_config.state_file_path = "test_state.json"
-            mock_config.state_save_frequency = 30
-            mock_config.putio_api_base_url = "https://api.put.io/v2"
-            mock_config.download_retry_limit = 3
-            mock_config.logging_level = "INFO"
-            mock_config.download_connections = 4
-            mock_config.download_timeout = 30
-            mock_config.destination_preserve_structure = True
+            mock_config.download_concurrent_files = 1
+            mock_config.scan_workers = 4
             
             # Mock state with one completed file
             mock_state = MagicMock()
             mock_state.get_completed_files.return_value = {"file1.txt": MagicMock()}
-            mock_state.is_file_completed.side_effect = lambda path: path == "file1.txt"
+            mock_state.completed_paths.return_value = frozenset({"file1.txt"})
             
             test_files = [
                 FileTreeNode("file1.txt", 1, 1024, False, 0, "file1.txt"),  # Already completed
@@ -153,6 +177,9 @@ base_path = "/tmp"
                                 assert mock_download_manager.download_file.call_count == 1
                                 downloaded_file = mock_download_manager.download_file.call_args[0][0]
                                 assert downloaded_file.name == "file2.txt"
+                                # Completed paths are read once, not looked up per file
+                                mock_state.completed_paths.assert_called_once()
+                                mock_state.is_file_completed.assert_not_called()
 
     def test_orchestrator_handles_download_failures(self):
         """Test orchestrator handles individual file download failures"""
@@ -168,11 +195,12 @@ base_path = "/tmp"
             mock_config.download_connections = 4
             mock_config.download_timeout = 30
             mock_config.destination_preserve_structure = True
+            mock_config.download_concurrent_files = 1
+            mock_config.scan_workers = 4
             
             mock_state = MagicMock()
             mock_state.get_completed_files.return_value = {}
-            mock_state.is_file_completed.return_value = False
-            mock_state.is_file_completed.return_value = False
+            mock_state.completed_paths.return_value = frozenset()
             
             test_files = [
                 FileTreeNode("file1.txt", 1, 1024, False, 0, "file1.txt")
@@ -201,6 +229,301 @@ base_path = "/tmp"
                                 mock_state.mark_file_failed.assert_called_once_with("file1.txt", "Network error")
                                 assert result["failed_files"] == 1
 
+    def test_orchestrator_downloads_files_concurrently(self):
+        """Test download.concurrent_files bounds overlapping downloads and every result is recorded"""
+        mock_config = MagicMock()
+        mock_config.logging_level = "INFO"
+        mock_config.download_concurrent_files = 3
+        mock_config.scan_workers = 4
+        
+        mock_state = MagicMock()
+        mock_state.completed_paths.return_value = frozenset()
+        
+        test_files = [FileTreeNode(f"file{i}.txt", i, 10, False, 0, f"file{i}.txt") for i in range(8)]
+        mock_scanner = MagicMock()
+        mock_scanner.get_all_files.return_value = test_files
+        
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+        
+        def slow_download(file_node, url):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return MagicMock(success=file_node.file_id != 5, error_message="Network error")
+        
+        mock_download_manager = MagicMock()
+        mock_download_manager.download_file.side_effect = slow_download
+        
+        with patch('putio_migrator.main.ConfigManager', return_value=mock_config), \
+                patch('putio_migrator.main.StateManager', return_value=mock_state), \
+                patch('putio_migrator.main.PutioClient'), \
+                patch('putio_migrator.main.FileScanner', return_value=mock_scanner), \
+                patch('putio_migrator.main.DownloadManager', return_value=mock_download_manager), \
+                patch('builtins.print'):
+            result = MigrationOrchestrator("test_config.toml").run_migration()
+        
+        assert 1 < peak <= 3
+        assert result["completed_files"] == 7
+        assert result["failed_files"] == 1
+        assert mock_state.mark_file_completed.call_count == 7
+        mock_state.mark_file_failed.assert_called_once_with("file5.txt", "Network error")
+
+    @pytest.mark.parametrize("concurrent_files, expected_order", [
+        (1, ["small.txt", "large.bin", "medium.bin"]),
+        (3, ["large.bin", "medium.bin", "small.txt"]),
+    ])
+    def test_orchestrator_orders_concurrent_downloads_largest_first(self, concurrent_files, expected_order):
+        """Test concurrent runs start the largest files first while serial runs keep scan order"""
+        mock_config = MagicMock()
+        mock_config.logging_level = "INFO"
+        mock_config.download_concurrent_files = concurrent_files
+        mock_config.scan_workers = 4
+        
+        mock_state = MagicMock()
+        mock_state.completed_paths.return_value = frozenset()
+        
+        test_files = [
+            FileTreeNode("small.txt", 1, 10, False, 0, "small.txt"),
+            FileTreeNode("large.bin", 2, 3000, False, 0, "large.bin"),
+            FileTreeNode("medium.bin", 3, 200, False, 0, "medium.bin"),
+        ]
+        mock_scanner = MagicMock()
+        mock_scanner.get_all_files.return_value = test_files
+        
+        mock_download_manager = MagicMock()
+        mock_download_manager.download_file.return_value = MagicMock(success=True)
+        
+        with patch('putio_migrator.main.ConfigManager', return_value=mock_config), \
+                patch('putio_migrator.main.StateManager', return_value=mock_state), \
+                patch('putio_migrator.main.PutioClient'), \
+                patch('putio_migrator.main.FileScanner', return_value=mock_scanner), \
+                patch('putio_migrator.main.DownloadManager', return_value=mock_download_manager), \
+                patch('builtins.print') as mock_print:
+            result = MigrationOrchestrator("test_config.toml").run_migration()
+        
+        assert result["completed_files"] == 3
+        printed = [str(c.args[0]) for c in mock_print.call_args_list if c.args]
+        listed = [line.split(". ", 1)[1].split(" (")[0] for line in printed
+                  if line.lstrip()[:2] in ("1.", "2.", "3.")]
+        assert listed == expected_order
+
+    def test_orchestrator_prefetches_next_download_url(self):
+        """Test the next file's URL is resolved while the current file downloads"""
+        mock_config = MagicMock()
+        mock_config.logging_level = "INFO"
+        mock_config.download_concurrent_files = 1
+        mock_config.scan_workers = 4
+        
+        mock_state = MagicMock()
+        mock_state.completed_paths.return_value = frozenset()
+        
+        test_files = [FileTreeNode(f"file{i}.txt", i, 10, False, 0, f"file{i}.txt") for i in range(3)]
+        mock_scanner = MagicMock()
+        mock_scanner.get_all_files.return_value = test_files
+        
+        resolved = {i: threading.Event() for i in range(3)}
+        
+        def get_download_url(file_id):
+            resolved[file_id].set()
+            if file_id == 2:
+                raise Exception("URL expired")
+            return f"https://download.put.io/{file_id}"
+        
+        prefetched_during = []
+        
+        def download(file_node, url):
+            assert url == f"https://download.put.io/{file_node.file_id}"
+            next_id = file_node.file_id + 1
+            if next_id in resolved:
+                prefetched_during.append(resolved[next_id].wait(5))
+            return MagicMock(success=True)
+        
+        mock_client = MagicMock()
+        mock_client.get_download_url.side_effect = get_download_url
+        mock_download_manager = MagicMock()
+        mock_download_manager.download_file.side_effect = download
+        
+        with patch('putio_migrator.main.ConfigManager', return_value=mock_config), \
+                patch('putio_migrator.main.StateManager', return_value=mock_state), \
+                patch('putio_migrator.main.PutioClient', return_value=mock_client), \
+                patch('putio_migrator.main.FileScanner', return_value=mock_scanner), \
+                patch('putio_migrator.main.DownloadManager', return_value=mock_download_manager), \
+                patch('builtins.print'):
+            result = MigrationOrchestrator("test_config.toml").run_migration()
+        
+        assert prefetched_during == [True, True]
+        assert mock_client.get_download_url.call_count == 3
+        assert result["completed_files"] == 2
+        # A failed lookahead still fails only its own file
+        mock_state.mark_file_failed.assert_called_once_with(
+            "file2.txt", "Failed to get download URL: URL expired")
+
+    def test_orchestrator_interrupt_cancels_queued_downloads(self):
+        """Test an interruption stops queued downloads before saving state"""
+        mock_config = MagicMock()
+        mock_config.logging_level = "INFO"
+        mock_config.download_concurrent_files = 1
+        mock_config.scan_workers = 4
+        
+        mock_state = MagicMock()
+        mock_state.completed_paths.return_value = frozenset()
+        
+        mock_scanner = MagicMock()
+        mock_scanner.get_all_files.return_value = [
+            FileTreeNode(f"file{i}.txt", i, 10, False, 0, f"file{i}.txt") for i in range(3)
+        ]
+        
+        def download_file(file_node, download_url):
+            # Ctrl+C is delivered to the main thread while this download runs
+            os.kill(os.getpid(), signal.SIGINT)
+            time.sleep(0.1)
+            return MagicMock(success=True)
+        
+        mock_download_manager = MagicMock()
+        mock_download_manager.download_file.side_effect = download_file
+        
+        with patch('putio_migrator.main.ConfigManager', return_value=mock_config), \
+                patch('putio_migrator.main.StateManager', return_value=mock_state), \
+                patch('putio_migrator.main.PutioClient'), \
+                patch('putio_migrator.main.FileScanner', return_value=mock_scanner), \
+                patch('putio_migrator.main.DownloadManager', return_value=mock_download_manager), \
+                patch('builtins.print'):
+            result = MigrationOrchestrator("test_config.toml").run_migration()
+        
+        assert result == {"success": False, "error": "Interrupted by user"}
+        assert mock_download_manager.download_file.call_count == 1
+        mock_state.save_state.assert_called_once()
+
+    @pytest.mark.parametrize("signum", [signal.SIGINT, signal.SIGTERM], ids=["sigint", "sigterm"])
+    def test_orchestrator_interrupted_download_stays_pending(self, signum):
+        """Test a signal stops downloads at once and the cut-short file is neither failed nor retried"""
+        mock_config = MagicMock()
+        mock_config.logging_level = "INFO"
+        mock_config.download_concurrent_files = 1
+        mock_config.scan_workers = 4
+        
+        mock_state = MagicMock()
+        mock_state.completed_paths.return_value = frozenset()
+        
+        mock_scanner = MagicMock()
+        mock_scanner.get_all_files.return_value = [
+            FileTreeNode(f"file{i}.txt", i, 10, False, 0, f"file{i}.txt") for i in range(3)
+        ]
+        
+        stop_events = []
+        
+        def download_manager_class(**kwargs):
+            stop_events.append(kwargs["stop_event"])
+            return mock_download_manager
+        
+        def download_file(file_node, download_url):
+            # The signal stops the migration; Ctrl+C kills the running Axel
+            # directly, SIGTERM through terminate_downloads()
+            os.kill(os.getpid(), signum)
+            assert stop_events[0].wait(5)
+            return MagicMock(success=False, error_message="Interrupted: Axel download failed")
+        
+        mock_download_manager = MagicMock()
+        mock_download_manager.download_file.side_effect = download_file
+        
+        stopping_when_interrupted = []
+        
+        def record_print(*args, **kwargs):
+            if args and "Interrupted with downloads in progress" in str(args[0]):
+                stopping_when_interrupted.append(stop_events[0].is_set())
+        
+        previous_sigint = signal.getsignal(signal.SIGINT)
+        previous_sigterm = signal.getsignal(signal.SIGTERM)
+        with patch('putio_migrator.main.ConfigManager', return_value=mock_config), \
+                patch('putio_migrator.main.StateManager', return_value=mock_state), \
+                patch('putio_migrator.main.PutioClient'), \
+                patch('putio_migrator.main.FileScanner', return_value=mock_scanner), \
+                patch('putio_migrator.main.DownloadManager', side_effect=download_manager_class), \
+                patch('builtins.print', side_effect=record_print):
+            result = MigrationOrchestrator("test_config.toml").run_migration()
+        
+        assert result == {"success": False, "error": "Interrupted by user"}
+        assert mock_download_manager.download_file.call_count == 1
+        mock_state.mark_file_failed.assert_not_called()
+        # The handler itself set the event, before the interrupt reached run_migration
+        assert stopping_when_interrupted == [True]
+        mock_download_manager.terminate_downloads.assert_called_once()
+        assert signal.getsignal(signal.SIGINT) is previous_sigint
+        assert signal.getsignal(signal.SIGTERM) is previous_sigterm
+
+    @pytest.mark.parametrize("rescan_on_startup, force_rescan, expect_scan", [
+        (True, False, True),
+        (False, False, False),
+        (False, True, True),
+    ])
+    def test_orchestrator_reuses_cached_scan_unless_rescanning(self, rescan_on_startup,
+                                                               force_rescan, expect_scan):
+        """Test rescan_on_startup = false reuses the cached scan, and --force-rescan overrides it"""
+        mock_config = MagicMock()
+        mock_config.logging_level = "INFO"
+        mock_config.scan_workers = 1
+        mock_config.rescan_on_startup = rescan_on_startup
+        mock_config.download_concurrent_files = 1
+        
+        mock_state = MagicMock()
+        mock_state.get_scan_cache.return_value = [[7, 0, "cached.txt", 10, False]]
+        
+        mock_client = MagicMock()
+        mock_client.get_account_info.return_value = {"info": {"username": "testuser"}}
+        mock_client.list_files.return_value = {"files": [
+            {"id": 8, "name": "fresh.txt", "size": 20, "file_type": "TEXT", "parent_id": 0}
+        ]}
+        
+        with patch('putio_migrator.main.ConfigManager', return_value=mock_config), \
+                patch('putio_migrator.main.StateManager', return_value=mock_state), \
+                patch('putio_migrator.main.PutioClient', return_value=mock_client):
+            orchestrator = MigrationOrchestrator("test_config.toml", force_rescan=force_rescan)
+            scan_result = orchestrator._scan_files()
+        
+        names = [f.name for f in scan_result["all_files"]]
+        if expect_scan:
+            assert names == ["fresh.txt"]
+            expected_cache = None if rescan_on_startup else [[8, 0, "fresh.txt", 20, False]]
+            mock_state.set_scan_cache.assert_called_once_with("testuser", expected_cache)
+        else:
+            assert names == ["cached.txt"]
+            mock_state.get_scan_cache.assert_called_once_with("testuser")
+            mock_client.list_files.assert_not_called()
+            mock_state.set_scan_cache.assert_not_called()
+
+    def test_orchestrator_scan_reports_final_totals(self):
+        """Test the scan prints its final totals even below the progress interval"""
+        mock_config = MagicMock()
+        mock_config.logging_level = "INFO"
+        mock_config.scan_workers = 1
+        mock_config.rescan_on_startup = True
+        mock_config.download_concurrent_files = 1
+        
+        mock_client = MagicMock()
+        mock_client.get_account_info.return_value = {"info": {"username": "testuser"}}
+        mock_client.list_files.return_value = {"files": [
+            {"id": i, "name": f"file{i}.txt", "size": 10, "file_type": "TEXT", "parent_id": 0}
+            for i in range(1, 4)
+        ]}
+        
+        with patch('putio_migrator.main.ConfigManager', return_value=mock_config), \
+                patch('putio_migrator.main.StateManager'), \
+                patch('putio_migrator.main.PutioClient', return_value=mock_client), \
+                patch('builtins.print') as mock_print:
+            orchestrator = MigrationOrchestrator("test_config.toml")
+            orchestrator._scan_files()
+        
+        printed = [call.args[0] for call in mock_print.call_args_list]
+        assert [line for line in printed if line.startswith("Scanning...")] == [
+            "Scanning... Found 3 files, 0 MB"
+        ]
+
     def test_main_function_with_config_argument(self):
         """Test main function with config file argument"""
         with patch('sys.argv', ['putio-migrator', '--config', 'test_config.toml']):
@@ -212,7 +535,8 @@ base_path = "/tmp"
                 with patch('builtins.print') as mock_print:
                     main()
                     
-                    mock_orchestrator.assert_called_once_with('test_config.toml')
+                    mock_orchestrator.assert_called_once_with('test_config.toml', force_rescan=False,
+                                                               dry_run=False)
                     mock_instance.run_migration.assert_called_once()
 
     def test_main_function_with_default_config(self):
@@ -225,7 +549,68 @@ base_path = "/tmp"
                 
                 main()
                 
-                mock_orchestrator.assert_called_once_with('config.toml')
+                mock_orchestrator.assert_called_once_with('config.toml', force_rescan=False, dry_run=False)
+
+    def test_main_function_check_config_validates_without_migrating(self):
+        """Test --check-config forces full validation and skips the migration"""
+        with patch('sys.argv', ['putio-migrator', '--config', 'test_config.toml', '--check-config']):
+            with patch('putio_migrator.main.ConfigManager') as mock_config:
+                with patch('putio_migrator.main.MigrationOrchestrator') as mock_orchestrator:
+                    with patch('builtins.print') as mock_print:
+                        main()
+                        
+                        mock_config.assert_called_once_with('test_config.toml')
+                        mock_config.return_value.validate_all.assert_called_once()
+                        mock_orchestrator.assert_not_called()
+                        mock_print.assert_called_once_with("Configuration is valid: test_config.toml")
+
+    def test_main_function_dry_run_reports_scanner_totals(self):
+        """Test --dry-run reports the scanner's totals and skips the migration"""
+        with patch('sys.argv', ['putio-migrator', '--config', 'test_config.toml', '--dry-run']):
+            with patch('putio_migrator.main.MigrationOrchestrator') as mock_orchestrator:
+                mock_instance = mock_orchestrator.return_value
+                mock_instance._scan_files.return_value = {
+                    "tree": MagicMock(),
+                    "all_files": [FileTreeNode("file1.txt", 1, 1024, False, 0, "file1.txt")],
+                    # Deliberately not the sum of the listed sizes
+                    "total_size": 3 * 1024**3
+                }
+                
+                with patch('builtins.print') as mock_print:
+                    main()
+                    
+                    mock_orchestrator.assert_called_once_with('test_config.toml', force_rescan=False,
+                                                               dry_run=True)
+                    printed = [str(c.args[0]) for c in mock_print.call_args_list if c.args]
+                    assert "Files found: 1" in printed
+                    assert "Total size: 3.00 GB" in printed
+                    mock_instance.run_migration.assert_not_called()
+
+    def test_main_function_turns_sigterm_into_interrupt(self):
+        """Test SIGTERM takes the same graceful shutdown path as Ctrl+C"""
+        with patch('sys.argv', ['putio-migrator']):
+            with patch('putio_migrator.main.MigrationOrchestrator') as mock_orchestrator, \
+                    patch('signal.signal') as mock_signal:
+                mock_orchestrator.return_value.run_migration.return_value = {"success": True}
+                main()
+        
+        mock_signal.assert_called_once()
+        signum, handler = mock_signal.call_args.args
+        assert signum == signal.SIGTERM
+        with pytest.raises(KeyboardInterrupt):
+            handler(signum, None)
+
+    def test_main_function_exits_on_interrupt_outside_migration(self):
+        """Test an interruption during a dry-run scan exits without a traceback"""
+        with patch('sys.argv', ['putio-migrator', '--dry-run']):
+            with patch('putio_migrator.main.MigrationOrchestrator') as mock_orchestrator, \
+                    patch('signal.signal'), patch('builtins.print') as mock_print:
+                mock_orchestrator.return_value._scan_files.side_effect = KeyboardInterrupt
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+        
+        assert exc_info.value.code == 1
+        mock_print.assert_called_with("\nInterrupted by user")
 
     def test_orchestrator_progress_reporting(self):
         """Test progress reporting during migration"""
@@ -241,11 +626,12 @@ base_path = "/tmp"
             mock_config.download_connections = 4
             mock_config.download_timeout = 30
             mock_config.destination_preserve_structure = True
+            mock_config.download_concurrent_files = 1
+            mock_config.scan_workers = 4
             
             mock_state = MagicMock()
             mock_state.get_completed_files.return_value = {}
-            mock_state.is_file_completed.return_value = False
-            mock_state.is_file_completed.return_value = False
+            mock_state.completed_paths.return_value = frozenset()
             
             test_files = [
                 FileTreeNode("file1.txt", 1, 1024, False, 0, "file1.txt"),
@@ -271,4 +657,7 @@ base_path = "/tmp"
                                     # Verify progress was printed
                                     assert mock_print.called
                                     printed_text = " ".join([str(call) for call in mock_print.call_args_list])
-                                    assert "progress" in printed_text.lower() or "migrating" in printed_text.lower()
\ No newline at end of file
+                                    assert "progress" in printed_text.lower() or "migrating" in printed_text.lower()
+                                    # One line per finished file, counted in completion order
+                                    assert "Progress: 1/2" in printed_text
+                                    assert "Progress: 2/2" in printed_text
\ No newline at end of file
@@ -1,9 +1,12 @@
+import gzip
+import json
 import pytest
 import responses
 import requests
 import time
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, call
 
+from putio_migrator import putio_client
 from putio_migrator.putio_client import PutioClient, PutioAPIError, PutioRateLimitError
 
 
@@ -58,10 +61,12 @@ class TestPutioClient:
         )
         
         client = PutioClient("test_token_123", retry_limit=2)
-        result = client.list_files()
+        with patch('time.sleep') as mock_sleep, patch('random.uniform', return_value=0.0):
+            result = client.list_files()
         
         assert result["files"] == []
         assert len(responses.calls) == 2
+        assert mock_sleep.call_args_list == [call(1)]
 
     @responses.activate
     def test_client_handles_rate_limiting(self):
@@ -84,27 +89,48 @@ class TestPutioClient:
         
         with patch('time.sleep') as mock_sleep:
             result = client.list_files()
-            mock_sleep.assert_called_once_with(2)
+            # Retry-After is honored first; the retry then passes the rate limiter
+            assert mock_sleep.call_args_list[0] == call(2)
+            # At 5 requests per second no token is ever more than 0.2s away
+            assert client._rate == 5
+            assert all(c.args[0] <= 1.0 / client._rate for c in mock_sleep.call_args_list[1:])
             assert result["files"] == []
 
     @responses.activate
     def test_client_exhausts_retries_and_raises_error(self):
         """Test client raises error after exhausting retries"""
-        # All requests fail
-        for _ in range(4):  # Default retry_limit is 3, so 4 total attempts
-            responses.add(
-                responses.GET,
-                "https://api.put.io/v2/files/list",
-                json={"error": "Server error"},
-                status=500
-            )
+        # All requests fail; a single registered response answers every attempt
+        responses.add(
+            responses.GET,
+            "https://api.put.io/v2/files/list",
+            json={"error": "Server error"},
+            status=500
+        )
         
         client = PutioClient("test_token_123", retry_limit=3)
         
-        with pytest.raises(PutioAPIError, match="API request failed after 3 retries"):
-            client.list_files()
+        with patch('time.sleep') as mock_sleep, patch('random.uniform', return_value=0.0):
+            with pytest.raises(PutioAPIError, match="API request failed after 3 retries"):
+                client.list_files()
         
         assert len(responses.calls) == 4
+        # Exponential backoff between attempts, without really waiting in tests
+        assert mock_sleep.call_args_list == [call(1), call(2), call(4)]
+
+    def test_client_backoff_adds_bounded_jitter(self):
+        """Test retry delays are stretched by at most BACKOFF_JITTER and capped"""
+        client = PutioClient("test_token_123")
+        
+        with patch('random.uniform', return_value=client.BACKOFF_JITTER) as mock_uniform:
+            assert client._backoff_delay(0) == 1.5
+            assert client._backoff_delay(2) == 6.0
+            assert client._backoff_delay(10) == client.BACKOFF_MAX_DELAY
+        
+        mock_uniform.assert_called_with(0, client.BACKOFF_JITTER)
+        
+        delays = [client._backoff_delay(attempt) for attempt in range(4)]
+        for attempt, delay in enumerate(delays):
+            assert 2 ** attempt <= delay <= (2 ** attempt) * (1 + client.BACKOFF_JITTER)
 
     @responses.activate
     def test_client_lists_files_in_folder(self):
@@ -112,7 +138,7 @@ class TestPutioClient:
         folder_id = 123
         responses.add(
             responses.GET,
-            f"https://api.put.io/v2/files/list?parent_id={folder_id}",
+            f"https://api.put.io/v2/files/list?parent_id={folder_id}&per_page=1000",
             json={
                 "files": [
                     {"id": 456, "name": "test_file.txt", "file_type": "VIDEO", "size": 1024},
@@ -130,6 +156,38 @@ class TestPutioClient:
         assert result["files"][0]["name"] == "test_file.txt"
         assert result["files"][1]["name"] == "subfolder"
 
+    @responses.activate
+    def test_client_follows_list_cursor_across_pages(self):
+        """Test list_files concatenates every page reached through the cursor"""
+        responses.add(
+            responses.GET,
+            "https://api.put.io/v2/files/list?parent_id=123&per_page=1000",
+            json={"files": [{"id": 1, "name": "a.txt"}], "parent": {"id": 123}, "cursor": "c1"},
+            status=200
+        )
+        responses.add(
+            responses.POST,
+            "https://api.put.io/v2/files/list/continue",
+            json={"files": [{"id": 2, "name": "b.txt"}], "cursor": "c2"},
+            status=200
+        )
+        responses.add(
+            responses.POST,
+            "https://api.put.io/v2/files/list/continue",
+            json={"files": [{"id": 3, "name": "c.txt"}], "cursor": None},
+            status=200
+        )
+        
+        client = PutioClient("test_token_123")
+        result = client.list_files(123)
+        
+        assert [f["id"] for f in result["files"]] == [1, 2, 3]
+        assert result["parent"] == {"id": 123}
+        assert "cursor" not in result
+        assert len(responses.calls) == 3
+        assert responses.calls[1].request.body == "cursor=c1&per_page=1000"
+        assert responses.calls[2].request.body == "cursor=c2&per_page=1000"
+
     @responses.activate
     def test_client_gets_download_url(self):
         """Test getting download URL for a file"""
@@ -165,4 +223,115 @@ class TestPutioClient:
             client.get_account_info()
             
             # Should sleep to respect rate limit
-            assert mock_sleep.called
\ No newline at end of file
+            assert mock_sleep.called
+
+    @responses.activate
+    def test_client_rate_limits_every_retry_attempt(self):
+        """Test retries are admitted by the rate limiter like first attempts"""
+        responses.add(
+            responses.GET,
+            "https://api.put.io/v2/files/list",
+            json={"error": "Server error"},
+            status=500
+        )
+        responses.add(
+            responses.GET,
+            "https://api.put.io/v2/files/list",
+            json={"files": [], "parent": {"id": 0}},
+            status=200
+        )
+        
+        client = PutioClient("test_token_123", retry_limit=1)
+        
+        with patch('time.sleep'):
+            with patch.object(client, '_wait_for_rate_limit') as mock_wait:
+                client.list_files()
+                assert mock_wait.call_count == 2
+
+    def test_rate_limiter_allows_burst_then_paces_requests(self):
+        """Test the token bucket admits a burst of rps requests, then one per interval"""
+        with patch('time.monotonic', return_value=100.0):
+            client = PutioClient("test_token_123", requests_per_second=5)
+            
+            with patch('time.sleep') as mock_sleep:
+                for _ in range(5):
+                    client._wait_for_rate_limit()
+                assert not mock_sleep.called
+                
+                # Bucket is empty: each further caller reserves the next slot
+                client._wait_for_rate_limit()
+                client._wait_for_rate_limit()
+                waits = [c.args[0] for c in mock_sleep.call_args_list]
+                assert waits == pytest.approx([0.2, 0.4])
+
+    def test_rate_limiter_refills_over_time(self):
+        """Test tokens refill at the configured rate up to the burst size"""
+        with patch('time.monotonic', return_value=100.0):
+            client = PutioClient("test_token_123", requests_per_second=2)
+            client._wait_for_rate_limit()
+            client._wait_for_rate_limit()
+        
+        # A long idle period refills no more than the burst size
+        with patch('time.monotonic', return_value=200.0), patch('time.sleep') as mock_sleep:
+            client._wait_for_rate_limit()
+            client._wait_for_rate_limit()
+            assert not mock_sleep.called
+            client._wait_for_rate_limit()
+            assert mock_sleep.call_args == call(pytest.approx(0.5))
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    @responses.activate
+    def test_client_parses_json_with_and_without_orjson(self, use_orjson):
+        """Test both JSON decoders return the same data and retry malformed bodies"""
+        if use_orjson:
+            pytest.importorskip("orjson")
+        responses.add(responses.GET, "https://api.put.io/v2/files/list",
+                      body="{not json", status=200, content_type="application/json")
+        responses.add(responses.GET, "https://api.put.io/v2/files/list",
+                      json={"files": [{"id": 1, "name": "caf\u00e9.txt"}]}, status=200)
+        
+        client = PutioClient("test_token_123", retry_limit=1)
+        decoder = putio_client.orjson if use_orjson else None
+        
+        with patch.object(putio_client, 'orjson', decoder), patch('time.sleep'):
+            result = client.list_files()
+        
+        assert result == {"files": [{"id": 1, "name": "caf\u00e9.txt"}]}
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_client_accepts_gzip_encoded_listings(self):
+        """Test listings are requested compressed and decoded transparently"""
+        listing = {"files": [{"id": i, "name": f"file{i}.txt"} for i in range(50)]}
+        responses.add(
+            responses.GET,
+            "https://api.put.io/v2/files/list",
+            body=gzip.compress(json.dumps(listing).encode()),
+            headers={"Content-Encoding": "gzip"},
+            content_type="application/json",
+            status=200
+        )
+        
+        client = PutioClient("test_token_123")
+        result = client.list_files()
+        
+        assert "gzip" in responses.calls[0].request.headers["Accept-Encoding"]
+        assert result["files"] == listing["files"]
+
+    def test_client_pools_a_connection_per_concurrent_caller(self):
+        """Test the session keeps pool_size keep-alive connections and leaves retries to the client"""
+        client = PutioClient("test_token_123", pool_size=8)
+        adapter = client.session.get_adapter("https://api.put.io/v2/files/list")
+        
+        assert adapter._pool_maxsize == 8
+        assert adapter.max_retries.total == 0
+        assert client.session.headers["Authorization"] == "Bearer test_token_123"
+
+    def test_client_close_releases_pooled_connections(self):
+        """Test close() closes the shared API session"""
+        client = PutioClient("test_token_123")
+        
+        with patch.object(client.session, 'close') as mock_close:
+            client.close()
+        
+        mock_close.assert_called_once()
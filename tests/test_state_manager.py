@@ -3,11 +3,14 @@ import tempfile
 import json
 import os
 import signal
+import sys
+import threading
 import time
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 from datetime import datetime
 
+from putio_migrator import state_manager
 from putio_migrator.state_manager import StateManager, MigrationState, FileState
 
 
@@ -15,10 +18,9 @@ class TestStateManager:
     
     def test_state_persists_across_restarts(self):
         """Test state persistence survives application restart"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            state_file = f.name
-        
-        try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "state.json")
+            
             # Create first state manager and add some data
             state1 = StateManager(state_file)
             state1.mark_file_completed("/test/file1.txt", 1024)
@@ -36,47 +38,46 @@ class TestStateManager:
             assert len(in_progress) == 1
             assert "/test/file3.txt" in in_progress
             assert in_progress["/test/file3.txt"].downloaded_bytes == 256
-        finally:
-            os.unlink(state_file)
 
-    def test_signal_handler_saves_state_on_interrupt(self):
-        """Test graceful interruption saves state"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            state_file = f.name
-        
-        try:
-            state = StateManager(state_file)
-            state.mark_file_completed("/test/file1.txt", 1024)
+    def test_state_manager_leaves_signal_handlers_alone(self):
+        """Test constructing a StateManager does not replace process signal handlers"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            before = (signal.getsignal(signal.SIGINT), signal.getsignal(signal.SIGTERM))
+            StateManager(os.path.join(temp_dir, "state.json"))
+            assert (signal.getsignal(signal.SIGINT), signal.getsignal(signal.SIGTERM)) == before
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_loaded_paths_are_stored_once(self, use_orjson):
+        """Test a loaded record shares its path string with its dict key"""
+        if use_orjson:
+            pytest.importorskip("orjson")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "state.json")
+            state1 = StateManager(state_file)
+            state1.mark_file_completed("/test/file1.txt", 1024)
+            state1.save_state()
             
-            # Test signal handler directly instead of sending real signal
-            with patch.object(state, 'save_state') as mock_save:
-                with patch('builtins.exit') as mock_exit:
-                    state._signal_handler(signal.SIGINT, None)
-                    mock_save.assert_called_once()
-                    mock_exit.assert_called_once_with(0)
-        finally:
-            os.unlink(state_file)
+            decoder = state_manager.orjson if use_orjson else None
+            with patch.object(state_manager, 'orjson', decoder):
+                state2 = StateManager(state_file)
+            
+            (key, file_state), = state2.state.files.items()
+            assert key == "/test/file1.txt"
+            assert file_state.file_path is key
 
     def test_state_manager_initializes_empty_state(self):
         """Test StateManager initializes with empty state for new file"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            state_file = f.name
-        
-        try:
-            os.unlink(state_file)  # Remove the file so it doesn't exist
-            state = StateManager(state_file)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state = StateManager(os.path.join(temp_dir, "state.json"))
             assert len(state.get_completed_files()) == 0
             assert len(state.get_failed_files()) == 0
             assert len(state.get_in_progress_files()) == 0
-        except FileNotFoundError:
-            pass  # It's okay if the file doesn't exist
 
     def test_state_tracks_file_completion(self):
         """Test marking files as completed"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            state_file = f.name
-        
-        try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "state.json")
+            
             state = StateManager(state_file)
             file_path = "/test/completed_file.txt"
             file_size = 1024
@@ -87,15 +88,26 @@ class TestStateManager:
             assert file_path in completed
             assert completed[file_path].total_bytes == file_size
             assert completed[file_path].status == "completed"
-        finally:
-            os.unlink(state_file)
+
+    def test_completed_paths_only_includes_completed_files(self):
+        """Test completed_paths returns an immutable set of completed paths"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "state.json")
+            
+            state = StateManager(state_file)
+            state.mark_file_completed("/test/done.txt", 1024)
+            state.mark_file_failed("/test/failed.txt", "Network timeout")
+            state.mark_file_in_progress("/test/partial.txt", 2048, 512)
+            
+            completed = state.completed_paths()
+            assert completed == frozenset({"/test/done.txt"})
+            assert isinstance(completed, frozenset)
 
     def test_state_tracks_file_failure(self):
         """Test marking files as failed with error information"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            state_file = f.name
-        
-        try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "state.json")
+            
             state = StateManager(state_file)
             file_path = "/test/failed_file.txt"
             error_msg = "Network timeout"
@@ -106,15 +118,12 @@ class TestStateManager:
             assert file_path in failed
             assert failed[file_path].error_message == error_msg
             assert failed[file_path].retry_count == 1
-        finally:
-            os.unlink(state_file)
 
     def test_state_tracks_download_progress(self):
         """Test tracking download progress for files"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            state_file = f.name
-        
-        try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "state.json")
+            
             state = StateManager(state_file)
             file_path = "/test/progress_file.txt"
             total_size = 1024
@@ -127,36 +136,300 @@ class TestStateManager:
             assert in_progress[file_path].total_bytes == total_size
             assert in_progress[file_path].downloaded_bytes == downloaded
             assert in_progress[file_path].status == "in_progress"
-        finally:
-            os.unlink(state_file)
 
     def test_state_handles_corrupted_file(self):
         """Test handling corrupted state files"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            f.write("invalid json content")
-            state_file = f.name
-        
-        try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "state.json")
+            Path(state_file).write_text("invalid json content")
+            
             # Should initialize empty state when file is corrupted
             state = StateManager(state_file)
             assert len(state.get_completed_files()) == 0
-        finally:
-            os.unlink(state_file)
 
     def test_state_auto_saves_periodically(self):
         """Test automatic state saving based on time interval"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            state_file = f.name
-        
-        try:
-            with patch('time.time') as mock_time:
-                mock_time.side_effect = [0, 31]  # Simulate 31 seconds passing
-                
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "state.json")
+            
+            clock = [0.0]
+            with patch('time.monotonic', side_effect=lambda: clock[0]), \
+                    patch('time.time', return_value=0.0):
                 state = StateManager(state_file, auto_save_interval=30)
                 state.mark_file_completed("/test/file1.txt", 1024)
                 
                 with patch.object(state, 'save_state') as mock_save:
+                    clock[0] = 29.0
+                    state.maybe_auto_save()
+                    mock_save.assert_not_called()
+                    
+                    # Only the monotonic clock counts; wall-clock jumps are ignored
+                    clock[0] = 31.0
                     state.maybe_auto_save()
                     mock_save.assert_called_once()
-        finally:
-            os.unlink(state_file)
\ No newline at end of file
+
+    def test_scan_cache_persists_across_restarts(self):
+        """Test cached scan records are saved, restored and can be cleared"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "state.json")
+            records = [[1, 0, "movie.mkv", 700, False], [2, 0, "shows", 0, True]]
+            
+            state1 = StateManager(state_file)
+            assert state1.get_scan_cache("alice") is None
+            state1.set_scan_cache("alice", records)
+            assert state1.state.scan_completed is True
+            assert state1.state.last_scan_time is not None
+            state1.save_state()
+            
+            state2 = StateManager(state_file)
+            assert state2.get_scan_cache("alice") == records
+            state2.set_scan_cache("alice", None)
+            state2.save_state()
+            
+            assert StateManager(state_file).get_scan_cache("alice") is None
+
+    def test_scan_cache_is_kept_out_of_the_snapshot(self):
+        """Test scan records live in their own file, keyed by the account they came from"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "state.json")
+            records = [[1, 0, "movie.mkv", 700, False]]
+            
+            state1 = StateManager(state_file)
+            state1.set_scan_cache("alice", records)
+            state1.save_state()
+            assert b"movie.mkv" not in Path(state_file).read_bytes()
+            assert json.loads(Path(state_file + ".scan").read_bytes()) == {
+                "account": "alice", "records": records
+            }
+            
+            # Another account's file IDs must never be migrated
+            state2 = StateManager(state_file)
+            assert state2.get_scan_cache("bob") is None
+            assert state2.get_scan_cache("alice") == records
+            
+            # A damaged cache, or one in an unknown layout, is ignored so the next run rescans
+            for damaged in (b"[[1, 0,", json.dumps(records).encode()):
+                Path(state_file + ".scan").write_bytes(damaged)
+                assert StateManager(state_file).get_scan_cache("alice") is None
+
+    @pytest.mark.parametrize("save_with_orjson, load_with_orjson", [
+        (True, True),
+        (True, False),
+        (False, True),
+        (False, False),
+    ])
+    def test_state_file_is_compact_utf8_json_for_either_encoder(self, save_with_orjson, load_with_orjson):
+        """Test orjson and stdlib json write the same compact format and read each other's files"""
+        if save_with_orjson or load_with_orjson:
+            pytest.importorskip("orjson")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "state.json")
+            
+            with patch.object(state_manager, 'orjson', state_manager.orjson if save_with_orjson else None):
+                state1 = StateManager(state_file)
+                state1.mark_file_completed("Filme/Amélie.mkv", 1024)
+                state1.mark_file_failed("broken.bin", "Network error")
+                state1.set_scan_cache("alice", [[1, 0, "Amélie.mkv", 1024, False]])
+                with patch('os.fsync', wraps=os.fsync) as mock_fsync:
+                    state1.save_state()
+                    mock_fsync.assert_called_once()
+            
+            raw = Path(state_file).read_bytes()
+            assert "Amélie".encode("utf-8") in raw
+            assert b"\n" not in raw
+            assert not Path(state_file + ".tmp").exists()
+            
+            with patch.object(state_manager, 'orjson', state_manager.orjson if load_with_orjson else None):
+                state2 = StateManager(state_file)
+            
+            assert state2.is_file_completed("Filme/Amélie.mkv")
+            assert state2.get_file_state("broken.bin").error_message == "Network error"
+            assert state2.get_scan_cache("alice") == [[1, 0, "Amélie.mkv", 1024, False]]
+
+    def test_state_changes_survive_restart_via_journal(self):
+        """Test unsaved changes are replayed from the journal and compaction removes it"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "state.json")
+            
+            state1 = StateManager(state_file)
+            state1.mark_file_completed("/test/file1.txt", 1024)
+            state1.save_state()
+            state1.mark_file_completed("/test/file2.txt", 2048)
+            state1.mark_file_failed("/test/file3.txt", "Network error")
+            state1.mark_file_failed("/test/file3.txt", "Timeout")
+            
+            journal = Path(state_file + ".wal")
+            assert len(journal.read_bytes().splitlines()) == 3
+            
+            # A crash can leave a torn final record; everything before it still applies
+            with open(journal, 'ab') as f:
+                f.write(b'{"file_path": "/test/fil')
+            
+            state2 = StateManager(state_file)
+            assert set(state2.get_completed_files()) == {"/test/file1.txt", "/test/file2.txt"}
+            failed = state2.get_file_state("/test/file3.txt")
+            assert failed.error_message == "Timeout"
+            assert failed.retry_count == 2
+            
+            state2.save_state()
+            assert not journal.exists()
+            assert set(StateManager(state_file).get_completed_files()) == {
+                "/test/file1.txt", "/test/file2.txt"
+            }
+
+    def test_journal_records_are_fsynced(self):
+        """Test each journaled change is flushed to disk before the call returns"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state = StateManager(os.path.join(temp_dir, "state.json"))
+            
+            with patch('os.fsync', wraps=os.fsync) as mock_fsync:
+                state.mark_file_completed("/test/file1.txt", 1024)
+                state.mark_file_failed("/test/file2.txt", "Network error")
+            
+            assert mock_fsync.call_count == 2
+            assert all(c.args[0] == state._journal.fileno() for c in mock_fsync.call_args_list)
+    
+    def test_torn_journal_record_does_not_swallow_later_changes(self):
+        """Test records appended after a torn one survive the next restart"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "state.json")
+            journal = Path(state_file + ".wal")
+            
+            state1 = StateManager(state_file)
+            state1.mark_file_completed("/test/file1.txt", 1024)
+            state1._close_journal()
+            with open(journal, 'ab') as f:
+                f.write(b'{"file_path": "/test/fil')
+            
+            # The restart compacts the damaged journal before appending to it
+            state2 = StateManager(state_file)
+            assert not journal.exists()
+            state2.mark_file_completed("/test/file2.txt", 2048)
+            state2.mark_file_completed("/test/file3.txt", 4096)
+            state2._close_journal()
+            
+            assert set(StateManager(state_file).get_completed_files()) == {
+                "/test/file1.txt", "/test/file2.txt", "/test/file3.txt"
+            }
+    
+    def test_journal_replay_skips_undecodable_records(self):
+        """Test one undecodable journal line doesn't drop the valid records after it"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "state.json")
+            
+            state1 = StateManager(state_file)
+            state1.mark_file_completed("/test/file1.txt", 1024)
+            state1._close_journal()
+            journal = Path(state_file + ".wal")
+            records = journal.read_bytes()
+            journal.write_bytes(b'{"file_path": "/test/fil' + b'\n' + records)
+            
+            assert set(StateManager(state_file).get_completed_files()) == {"/test/file1.txt"}
+
+    def test_auto_save_skips_snapshot_without_changes(self):
+        """Test maybe_auto_save only rewrites the snapshot when changes are journaled"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state = StateManager(os.path.join(temp_dir, "state.json"), auto_save_interval=0)
+            
+            with patch.object(state, 'save_state', wraps=state.save_state) as mock_save:
+                state.maybe_auto_save()
+                mock_save.assert_not_called()
+                
+                state.mark_file_completed("/test/file1.txt", 1024)
+                state.maybe_auto_save()
+                state.maybe_auto_save()
+                mock_save.assert_called_once()
+            
+            # Let the background snapshot finish before the directory goes away
+            state._wait_for_writer()
+
+    def test_auto_save_writes_snapshot_in_background(self):
+        """Test periodic compaction rotates the journal and writes off the caller's thread"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "state.json")
+            state = StateManager(state_file, auto_save_interval=0)
+            state.mark_file_completed("/test/file1.txt", 1024)
+            
+            written = []
+            write_snapshot = state._write_snapshot
+            
+            def slow_write(payload):
+                release.wait(5)
+                written.append(payload)
+                write_snapshot(payload)
+            
+            release = threading.Event()
+            with patch.object(state, '_write_snapshot', side_effect=slow_write):
+                state.maybe_auto_save()
+                # The caller returns while the snapshot is still being written;
+                # the folded-in journal stays replayable and new changes go to a new one
+                assert not written
+                assert state.previous_journal_path.exists()
+                state.mark_file_completed("/test/file2.txt", 2048)
+                assert state.journal_path.exists()
+                
+                # An in-flight compaction postpones the next one
+                state.maybe_auto_save()
+                release.set()
+                state._wait_for_writer()
+            
+            assert len(written) == 1
+            assert not state.previous_journal_path.exists()
+            assert set(StateManager(state_file).completed_paths()) == {"/test/file1.txt", "/test/file2.txt"}
+            
+            state.save_state()
+            assert not state.journal_path.exists()
+            assert set(StateManager(state_file).completed_paths()) == {"/test/file1.txt", "/test/file2.txt"}
+
+    def test_failed_background_save_keeps_journal_and_falls_back(self):
+        """Test a failed background write leaves changes replayable and the next save is synchronous"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, "state.json")
+            state = StateManager(state_file, auto_save_interval=0)
+            state.mark_file_completed("/test/file1.txt", 1024)
+            
+            with patch.object(state, '_write_snapshot', side_effect=OSError("disk full")):
+                state.maybe_auto_save()
+                state._wait_for_writer()
+            
+            assert state.previous_journal_path.exists()
+            assert StateManager(state_file).completed_paths() == frozenset({"/test/file1.txt"})
+            
+            state.mark_file_completed("/test/file2.txt", 2048)
+            state.maybe_auto_save()
+            assert state._writer is None
+            assert not state.previous_journal_path.exists()
+            assert not state.journal_path.exists()
+            assert set(StateManager(state_file).completed_paths()) == {"/test/file1.txt", "/test/file2.txt"}
+
+    def test_timestamps_are_cached_within_granularity(self):
+        """Test bursts of state changes share one timestamp until it expires"""
+        with patch.object(state_manager, '_timestamp_cache', ("", float("-inf"))):
+            with patch('time.monotonic', return_value=50.0):
+                first = FileState("/a.txt", 1).last_updated
+                second = FileState("/b.txt", 1).last_updated
+            assert first == second
+            datetime.fromisoformat(first)
+            
+            with patch('time.monotonic', return_value=50.05):
+                assert FileState("/c.txt", 1).last_updated == first
+            
+            with patch('time.monotonic', return_value=50.2), \
+                    patch.object(state_manager, 'datetime') as mock_datetime:
+                mock_datetime.now.return_value.isoformat.return_value = "2026-01-01T00:00:00"
+                assert FileState("/d.txt", 1).last_updated == "2026-01-01T00:00:00"
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_slotted_file_state_round_trips(self, use_orjson):
+        """Test per-file records drop the instance __dict__ and still serialize"""
+        if use_orjson:
+            pytest.importorskip("orjson")
+        file_state = FileState("/test/file.txt", 1024, status="completed")
+        assert not hasattr(file_state, "__dict__")
+        
+        decoder = state_manager.orjson if use_orjson else None
+        with patch.object(state_manager, 'orjson', decoder):
+            data = state_manager._loads(state_manager._dumps(file_state))
+        assert FileState(**data) == file_state